@@ -0,0 +1,39 @@
+"""Add trigram indexes for task search
+
+Revision ID: 187437486dd8
+Revises: a04ee1f98ed5
+Create Date: 2026-10-18 10:02:17.861305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '187437486dd8'
+down_revision: Union[str, None] = 'a04ee1f98ed5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for column in ('title', 'description'):
+            op.create_index(
+                f'ix_tasks_{column}_trgm',
+                'tasks',
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_description_trgm', table_name='tasks')
+    op.drop_index('ix_tasks_title_trgm', table_name='tasks')
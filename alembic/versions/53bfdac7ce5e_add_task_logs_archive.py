@@ -0,0 +1,38 @@
+"""Add task logs archive
+
+Revision ID: 53bfdac7ce5e
+Revises: 56004cc93bf8
+Create Date: 2026-10-18 14:02:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '53bfdac7ce5e'
+down_revision: Union[str, None] = '56004cc93bf8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # колонки совпадают с task_logs, внешнего ключа нет: архив переживает удаление задачи
+    op.create_table('task_logs_archive',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_logs_archive_created_at', 'task_logs_archive', ['created_at'], postgresql_using='brin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_logs_archive_created_at', table_name='task_logs_archive', postgresql_using='brin')
+    op.drop_table('task_logs_archive')
@@ -0,0 +1,66 @@
+"""Gapped ordering for columns and tasks
+
+Revision ID: 56004cc93bf8
+Revises: 187437486dd8
+Create Date: 2026-10-18 11:26:09.417735
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '56004cc93bf8'
+down_revision: Union[str, None] = '187437486dd8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ORDER_GAP = 1024
+
+
+def _renumber(table: str, scope: str, order_by: str, gap: int) -> None:
+    op.execute(
+        f'UPDATE {table} SET "order" = ranked.position * {gap} '
+        f'FROM (SELECT id, row_number() OVER (PARTITION BY {scope} ORDER BY {order_by}) AS position '
+        f'FROM {table}) AS ranked '
+        f'WHERE {table}.id = ranked.id'
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('columns', 'order',
+               existing_type=sa.Integer(),
+               type_=sa.BigInteger(),
+               existing_nullable=False)
+    # плотные позиции 1..n превращаются в позиции с шагом, заодно исчезают дубликаты
+    _renumber('columns', 'project_id', '"order", created_at, id', ORDER_GAP)
+    op.drop_index('ix_columns_project_id_order', table_name='columns')
+    op.create_unique_constraint(
+        'uq_columns_project_id_order', 'columns', ['project_id', 'order'],
+        deferrable=True, initially='IMMEDIATE'
+    )
+
+    op.add_column('tasks', sa.Column('order', sa.BigInteger(), nullable=True))
+    _renumber('tasks', 'column_id', 'created_at, id', ORDER_GAP)
+    op.alter_column('tasks', 'order', existing_type=sa.BigInteger(), nullable=False)
+    op.create_unique_constraint(
+        'uq_tasks_column_id_order', 'tasks', ['column_id', 'order'],
+        deferrable=True, initially='IMMEDIATE'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_tasks_column_id_order', 'tasks', type_='unique')
+    op.drop_column('tasks', 'order')
+
+    op.drop_constraint('uq_columns_project_id_order', 'columns', type_='unique')
+    _renumber('columns', 'project_id', '"order", id', 1)
+    op.create_index('ix_columns_project_id_order', 'columns', ['project_id', 'order'])
+    op.alter_column('columns', 'order',
+               existing_type=sa.BigInteger(),
+               type_=sa.Integer(),
+               existing_nullable=False)
@@ -0,0 +1,61 @@
+"""Add foreign key and sort indexes
+
+Revision ID: a04ee1f98ed5
+Revises: 5f1952635868
+Create Date: 2026-10-18 09:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a04ee1f98ed5'
+down_revision: Union[str, None] = '5f1952635868'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_columns_project_id_order', 'columns', ['project_id', 'order']),
+    ('ix_tasks_column_id_priority', 'tasks', ['column_id', 'priority', 'id']),
+    ('ix_tasks_column_id_created_at', 'tasks', ['column_id', 'created_at', 'id']),
+    ('ix_tasks_column_id_last_updated_at', 'tasks', ['column_id', 'last_updated_at', 'id']),
+    ('ix_task_logs_task_id_created_at', 'task_logs', ['task_id', 'created_at']),
+    ('ix_task_assignees_user_id', 'task_assignees', ['user_id']),
+    ('ix_project_users_user_id', 'project_users', ['user_id']),
+]
+
+UNIQUE_CONSTRAINTS = [
+    ('uq_task_assignees_task_id_user_id', 'task_assignees', ['task_id', 'user_id']),
+    ('uq_project_users_project_id_user_id', 'project_users', ['project_id', 'user_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # дубликаты назначений мешают уникальным ограничениям: оставляем по одной строке
+    for _, table, (first, second) in UNIQUE_CONSTRAINTS:
+        op.execute(
+            f'DELETE FROM {table} a USING {table} b '
+            f'WHERE a.{first} = b.{first} AND a.{second} = b.{second} AND a.id > b.id'
+        )
+
+    # индексы строятся CONCURRENTLY, чтобы не блокировать запись в больших таблицах
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, columns in UNIQUE_CONSTRAINTS:
+            op.create_index(name, table, columns, unique=True, postgresql_concurrently=True, if_not_exists=True)
+
+    for name, table, _ in UNIQUE_CONSTRAINTS:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in UNIQUE_CONSTRAINTS:
+        op.drop_constraint(name, table, type_='unique')
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,116 @@
+"""Partition task logs by month
+
+Revision ID: cccff42c475d
+Revises: 53bfdac7ce5e
+Create Date: 2026-10-18 15:47:20.861093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cccff42c475d'
+down_revision: Union[str, None] = '53bfdac7ce5e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def _log_columns(with_fk: bool) -> list:
+    columns = [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    ]
+    if with_fk:
+        columns.append(sa.ForeignKeyConstraint(['task_id'], ['tasks.id']))
+    return columns
+
+
+def _create_month_partitions(table: str, months_query: str) -> None:
+    # секции task_logs_pYYYYMM на каждый месяц из months_query
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month timestamp;
+        BEGIN
+            FOR month IN {months_query} LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_p' || to_char(month, 'YYYYMM'), month, month + interval '1 month'
+                );
+            END LOOP;
+        END $$;
+    """)
+
+
+def _copy(source: str, target: str) -> None:
+    op.execute(
+        f'INSERT INTO {target} (id, task_id, message, created_at) '
+        f'SELECT id, task_id, message, created_at FROM {source}'
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table('task_logs', 'task_logs_unpartitioned')
+    op.execute('ALTER INDEX task_logs_pkey RENAME TO task_logs_unpartitioned_pkey')
+    op.execute('ALTER INDEX ix_task_logs_task_id_created_at RENAME TO ix_task_logs_unpartitioned_task_id_created_at')
+    op.rename_table('task_logs_archive', 'task_logs_archive_unpartitioned')
+    op.execute('ALTER INDEX task_logs_archive_pkey RENAME TO task_logs_archive_unpartitioned_pkey')
+    op.execute('ALTER INDEX ix_task_logs_archive_created_at RENAME TO ix_task_logs_archive_unpartitioned_created_at')
+
+    # ключ секционирования обязан входить в первичный ключ
+    op.create_table('task_logs',
+    *_log_columns(with_fk=True),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_task_logs_task_id_created_at', 'task_logs', ['task_id', 'created_at'])
+    # DEFAULT ловит строки, для месяца которых секция еще не создана; обычно пустая
+    op.execute('CREATE TABLE task_logs_default PARTITION OF task_logs DEFAULT')
+    _create_month_partitions(
+        'task_logs',
+        "SELECT generate_series("
+        "date_trunc('month', coalesce((SELECT min(created_at) FROM task_logs_unpartitioned), now() AT TIME ZONE 'utc')), "
+        f"date_trunc('month', now() AT TIME ZONE 'utc') + interval '{MONTHS_AHEAD} months', interval '1 month')"
+    )
+    _copy('task_logs_unpartitioned', 'task_logs')
+    op.drop_table('task_logs_unpartitioned')
+
+    # архив секционирован так же: истекшая секция task_logs переезжает в него через DETACH/ATTACH
+    op.create_table('task_logs_archive',
+    *_log_columns(with_fk=False),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_task_logs_archive_created_at', 'task_logs_archive', ['created_at'], postgresql_using='brin')
+    _create_month_partitions(
+        'task_logs_archive',
+        "SELECT DISTINCT date_trunc('month', created_at) FROM task_logs_archive_unpartitioned"
+    )
+    _copy('task_logs_archive_unpartitioned', 'task_logs_archive')
+    op.drop_table('task_logs_archive_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, with_fk in (('task_logs', True), ('task_logs_archive', False)):
+        op.create_table(f'{table}_unpartitioned',
+        *_log_columns(with_fk),
+        sa.PrimaryKeyConstraint('id', name=f'{table}_unpartitioned_pkey')
+        )
+        _copy(table, f'{table}_unpartitioned')
+        # секции удаляются вместе с родительской таблицей
+        op.drop_table(table)
+        op.rename_table(f'{table}_unpartitioned', table)
+        op.execute(f'ALTER INDEX {table}_unpartitioned_pkey RENAME TO {table}_pkey')
+
+    op.create_index('ix_task_logs_task_id_created_at', 'task_logs', ['task_id', 'created_at'])
+    op.create_index('ix_task_logs_archive_created_at', 'task_logs_archive', ['created_at'], postgresql_using='brin')
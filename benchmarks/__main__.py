@@ -0,0 +1,107 @@
+"""Нагрузочный бенчмарк на синтетических досках.
+
+    python -m benchmarks --projects 20 --tasks 80 --requests 500 --concurrency 16
+
+База берется из тех же DB_* переменных, что и приложение, и перед загрузкой очищается
+целиком, поэтому имя базы должно содержать "bench" (или нужен --force). С --no-seed набор
+не загружается: манифест воспроизводится по тем же seed и параметрам, что и при загрузке.
+Результат пишется в JSON (по умолчанию benchmarks/results/<commit>-<время>.json).
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from src.settings import settings
+from src.core.database import AsyncSessionLocal, engine
+from src.main import app
+from benchmarks.dataset import DatasetConfig, generate_dataset
+from benchmarks.runner import SCENARIOS, BenchmarkRunner, RunConfig
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def benchmark(dataset_config: DatasetConfig, run_config: RunConfig, scenarios: list[str], seed: bool) -> dict:
+    started = datetime.utcnow()
+    if seed:
+        async with AsyncSessionLocal() as session:
+            dataset = await generate_dataset(session, dataset_config)
+    else:
+        dataset = await generate_dataset(None, dataset_config)
+    seeded = datetime.utcnow()
+
+    results = await BenchmarkRunner(app, dataset, run_config).run(scenarios)
+    await engine.dispose()
+    return {
+        "commit": git_commit(),
+        "started_at": started.isoformat(),
+        "seed_seconds": round((seeded - started).total_seconds(), 3) if seed else None,
+        "dataset": dataset_config.model_dump(),
+        "rows": dataset.counts,
+        "run": run_config.model_dump(),
+        "results": {name: result.model_dump() for name, result in results.items()},
+    }
+
+
+if __name__ == "__main__":
+    defaults = DatasetConfig()
+    run_defaults = RunConfig()
+    parser = argparse.ArgumentParser(description="Seed a synthetic dataset and benchmark hot API endpoints")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--projects", type=int, default=defaults.projects)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--members", type=float, default=defaults.members, help="mean members per project")
+    parser.add_argument("--columns", type=float, default=defaults.columns, help="mean columns per project")
+    parser.add_argument("--tasks", type=float, default=defaults.tasks, help="mean tasks per column")
+    parser.add_argument("--assignees", type=float, default=defaults.assignees, help="mean assignees per task")
+    parser.add_argument("--logs", type=float, default=defaults.logs, help="mean logs per task")
+    parser.add_argument("--skew", type=float, default=defaults.skew, help="lognormal sigma of the counts above")
+    parser.add_argument("--requests", type=int, default=run_defaults.requests, help="requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=run_defaults.login_requests)
+    parser.add_argument("--concurrency", type=int, default=run_defaults.concurrency)
+    parser.add_argument("--warmup", type=int, default=run_defaults.warmup)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of scenarios")
+    parser.add_argument("--no-seed", action="store_true", help="reuse the dataset loaded by a previous run")
+    parser.add_argument("--force", action="store_true", help="allow truncating a database without 'bench' in its name")
+    parser.add_argument("--output", type=Path, help="result file (default: benchmarks/results/<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - SCENARIOS.keys()
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if not args.no_seed and "bench" not in settings.DB_NAME and not args.force:
+        parser.error(f"refusing to truncate database {settings.DB_NAME!r}: use a *bench* database or --force")
+
+    dataset_config = DatasetConfig(
+        seed=args.seed, projects=args.projects, users=args.users, members=args.members, columns=args.columns,
+        tasks=args.tasks, assignees=args.assignees, logs=args.logs, skew=args.skew
+    )
+    run_config = RunConfig(
+        seed=args.seed, requests=args.requests, login_requests=args.login_requests,
+        concurrency=args.concurrency, warmup=args.warmup
+    )
+    report = asyncio.run(benchmark(dataset_config, run_config, scenarios, seed=not args.no_seed))
+
+    output = args.output or RESULTS_DIR / f"{report['commit'] or 'nogit'}-{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    for name, result in report["results"].items():
+        print(
+            f"{name:12} p50={result['p50_ms']:8.2f}ms p95={result['p95_ms']:8.2f}ms "
+            f"p99={result['p99_ms']:8.2f}ms {result['throughput_rps']:8.1f} rps errors={result['errors']}"
+        )
+    print(f"Saved {output}", file=sys.stderr)
@@ -0,0 +1,225 @@
+import math
+import random
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import Base
+from src.core.hashing import pwd_context
+from src.crud.access import MEMBER, OWNER
+from src.crud.ordering import ORDER_GAP
+from src.models.models import User, Project, ProjectUser, BColumn, Task, TaskAssignee, TaskLog
+
+BENCH_PASSWORD = "bench-password"
+EMAIL_DOMAIN = "bench.example.com"
+
+TITLE_VERBS = ["Fix", "Add", "Refactor", "Review", "Deploy", "Document", "Test", "Migrate"]
+TITLE_NOUNS = ["login", "board", "export", "search", "billing", "profile", "cache", "report"]
+STATUSES = ["Active", "In progress", "Review", "Done"]
+STATUS_WEIGHTS = [5, 3, 1, 4]
+
+# порядок загрузки: родительские таблицы раньше дочерних
+LOAD_ORDER = [User, Project, ProjectUser, BColumn, Task, TaskAssignee, TaskLog]
+
+
+class DatasetConfig(BaseModel):
+    seed: int = 42
+    projects: int = 10
+    users: int = 200
+    # средние значения; фактические числа на проект/колонку/задачу распределены логнормально
+    members: float = 8
+    columns: float = 6
+    tasks: float = 40
+    assignees: float = 1.5
+    logs: float = 6
+    skew: float = 1.0
+    history_days: int = 30
+
+
+class ProjectManifest(BaseModel):
+    id: UUID
+    owner_id: UUID
+    owner_email: str
+    column_ids: list[UUID]
+    task_ids: list[UUID]
+
+
+class Dataset(BaseModel):
+    config: DatasetConfig
+    projects: list[ProjectManifest]
+    counts: dict[str, int]
+
+
+def _skewed(rng: random.Random, mean: float, skew: float, minimum: int = 0) -> int:
+    # логнормальное распределение с заданным средним: немного огромных колонок и много мелких
+    if mean <= 0:
+        return minimum
+    mu = math.log(mean) - skew ** 2 / 2
+    return max(minimum, round(rng.lognormvariate(mu, skew)))
+
+
+def _zipf_weights(count: int) -> list[float]:
+    return [1 / (rank + 1) for rank in range(count)]
+
+
+class DatasetGenerator:
+    """Детерминированно (по seed) строит строки всех таблиц; id тоже берутся из генератора."""
+
+    def __init__(self, config: DatasetConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.now = datetime.utcnow().replace(microsecond=0)
+
+    def _id(self) -> UUID:
+        return UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _timestamp(self, not_before: datetime | None = None) -> datetime:
+        start = not_before or self.now - timedelta(days=self.config.history_days)
+        span = max((self.now - start).total_seconds(), 1)
+        return start + timedelta(seconds=self.rng.uniform(0, span))
+
+    def users(self, password_hash: str) -> list[dict]:
+        rows = []
+        for index in range(self.config.users):
+            created_at = self._timestamp()
+            rows.append({
+                "id": self._id(),
+                "username": f"bench_user_{index}",
+                "email": f"bench{index}@{EMAIL_DOMAIN}",
+                "password": password_hash,
+                "description": f"Benchmark user {index}",
+                "created_at": created_at,
+                "last_updated_at": created_at,
+            })
+        return rows
+
+    def project(self, index: int, users: list[dict]) -> tuple[ProjectManifest, dict[type, list[dict]]]:
+        config = self.config
+        rng = self.rng
+        rows: dict[type, list[dict]] = {model: [] for model in LOAD_ORDER}
+        created_at = self._timestamp()
+        project_id = self._id()
+        rows[Project].append({
+            "id": project_id,
+            "name": f"Bench project {index}",
+            "description": f"Synthetic board {index}",
+            "created_at": created_at,
+            "last_updated_at": created_at,
+        })
+
+        member_count = min(len(users), _skewed(rng, config.members, config.skew, minimum=1))
+        members = rng.sample(users, member_count)
+        for position, user in enumerate(members):
+            rows[ProjectUser].append({
+                "id": self._id(),
+                "project_id": project_id,
+                "user_id": user["id"],
+                "role": OWNER if position == 0 else MEMBER,
+            })
+        # немногие участники получают большую часть задач
+        member_weights = _zipf_weights(len(members))
+
+        column_ids, task_ids = [], []
+        for column_index in range(_skewed(rng, config.columns, config.skew / 2, minimum=1)):
+            column_id = self._id()
+            column_ids.append(column_id)
+            rows[BColumn].append({
+                "id": column_id,
+                "project_id": project_id,
+                "name": f"Column {column_index}",
+                "description": f"Synthetic column {column_index}",
+                "order": (column_index + 1) * ORDER_GAP,
+                "created_at": created_at,
+                "last_updated_at": created_at,
+            })
+
+            for task_index in range(_skewed(rng, config.tasks, config.skew)):
+                task_id = self._id()
+                task_ids.append(task_id)
+                task_created = self._timestamp(created_at)
+                title = f"{rng.choice(TITLE_VERBS)} {rng.choice(TITLE_NOUNS)} #{task_index}"
+                logs = [self._timestamp(task_created) for _ in range(_skewed(rng, config.logs, config.skew))]
+                rows[Task].append({
+                    "id": task_id,
+                    "column_id": column_id,
+                    "title": title,
+                    "description": f"{title} in column {column_index}",
+                    "status": rng.choices(STATUSES, STATUS_WEIGHTS)[0],
+                    "priority": min(10, max(1, round(rng.gauss(5, 2)))),
+                    "order": (task_index + 1) * ORDER_GAP,
+                    "created_at": task_created,
+                    "last_updated_at": max(logs, default=task_created),
+                })
+
+                assignee_count = min(len(members), _skewed(rng, config.assignees, config.skew))
+                for user in {user["id"] for user in rng.choices(members, member_weights, k=assignee_count)}:
+                    rows[TaskAssignee].append({
+                        "id": self._id(),
+                        "task_id": task_id,
+                        "user_id": user,
+                        "assigned_at": task_created,
+                    })
+                for log_created in sorted(logs):
+                    rows[TaskLog].append({
+                        "id": self._id(),
+                        "task_id": task_id,
+                        "message": f"Task updated: status={rng.choice(STATUSES)}",
+                        "created_at": log_created,
+                    })
+
+        manifest = ProjectManifest(
+            id=project_id,
+            owner_id=members[0]["id"],
+            owner_email=members[0]["email"],
+            column_ids=column_ids,
+            task_ids=task_ids
+        )
+        return manifest, rows
+
+
+async def _copy(session: AsyncSession, model, rows: list[dict]) -> None:
+    if not rows:
+        return
+    columns = [column.name for column in model.__table__.columns]
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        model.__tablename__, records=[tuple(row[name] for name in columns) for row in rows], columns=columns
+    )
+
+
+async def truncate_all(session: AsyncSession) -> None:
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    await session.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+
+async def generate_dataset(session: AsyncSession | None, config: DatasetConfig) -> Dataset:
+    """Строит набор данных; при session=None только воспроизводит манифест без загрузки в БД."""
+    generator = DatasetGenerator(config)
+    # один bcrypt-хэш на всех: иначе генерация упирается в хэширование паролей
+    users = generator.users(pwd_context.hash(BENCH_PASSWORD) if session is not None else "")
+    counts = {model.__tablename__: 0 for model in LOAD_ORDER}
+    counts[User.__tablename__] = len(users)
+
+    if session is not None:
+        await truncate_all(session)
+        await _copy(session, User, users)
+
+    # проект за проектом: в памяти строки только одной доски
+    projects = []
+    for index in range(config.projects):
+        manifest, rows = generator.project(index, users)
+        projects.append(manifest)
+        for model in LOAD_ORDER[1:]:
+            counts[model.__tablename__] += len(rows[model])
+            if session is not None:
+                await _copy(session, model, rows[model])
+
+    if session is not None:
+        await session.commit()
+        await session.execute(text("ANALYZE"))
+        await session.commit()
+    return Dataset(config=config, projects=projects, counts=counts)
@@ -0,0 +1,160 @@
+import asyncio
+import math
+import random
+import time
+from typing import Callable
+
+import httpx
+from pydantic import BaseModel
+
+from src.core.jwt_utils import create_access_token
+from benchmarks.dataset import BENCH_PASSWORD, TITLE_NOUNS, Dataset, ProjectManifest
+
+# запрос сценария: (метод, путь, параметры, json-тело, email пользователя, от имени которого он идет)
+RequestSpec = tuple[str, str, dict | None, dict | None, str | None]
+
+
+class RunConfig(BaseModel):
+    seed: int = 42
+    requests: int = 200
+    login_requests: int = 20
+    concurrency: int = 10
+    warmup: int = 10
+
+
+class ScenarioResult(BaseModel):
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+    throughput_rps: float
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    # nearest-rank: значение, не меньше которого percent% выборки
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _hot(rng: random.Random, items: list):
+    # квадрат равномерного смещает выбор к началу списка: часть досок и задач "горячие"
+    return items[int(rng.random() ** 2 * len(items))]
+
+
+def _project_with_tasks(rng: random.Random, projects: list[ProjectManifest]) -> ProjectManifest:
+    return _hot(rng, [project for project in projects if project.task_ids] or projects)
+
+
+def board_load(rng: random.Random, dataset: Dataset) -> RequestSpec:
+    project = _hot(rng, dataset.projects)
+    return "GET", f"/projects/{project.id}/board", None, None, project.owner_email
+
+
+def task_list(rng: random.Random, dataset: Dataset) -> RequestSpec:
+    project = _hot(rng, dataset.projects)
+    params = rng.choice([
+        {"sort_by_priority": "desc"},
+        {"sort_by_create_time": "asc"},
+        {"sort_by_update_time": "desc", "include": "users"},
+        {"name_contains": rng.choice(TITLE_NOUNS)},
+        {"name_contains": rng.choice(TITLE_NOUNS), "sort_by_priority": "asc", "include": "users,logs"},
+    ])
+    column_id = rng.choice(project.column_ids)
+    return "GET", f"/tasks/column/{column_id}", {"limit": 50, **params}, None, project.owner_email
+
+
+def task_update(rng: random.Random, dataset: Dataset) -> RequestSpec:
+    project = _project_with_tasks(rng, dataset.projects)
+    task_id = _hot(rng, project.task_ids)
+    body = {"priority": rng.randint(1, 10), "status": rng.choice(["Active", "In progress", "Done"])}
+    return "PUT", f"/tasks/{task_id}", None, body, project.owner_email
+
+
+def log_listing(rng: random.Random, dataset: Dataset) -> RequestSpec:
+    project = _project_with_tasks(rng, dataset.projects)
+    task_id = _hot(rng, project.task_ids)
+    return "GET", f"/tasks/{task_id}/logs", {"limit": 50}, None, project.owner_email
+
+
+def login(rng: random.Random, dataset: Dataset) -> RequestSpec:
+    project = rng.choice(dataset.projects)
+    body = {"email": project.owner_email, "password": BENCH_PASSWORD}
+    return "POST", "/auth/login", None, body, None
+
+
+SCENARIOS: dict[str, Callable[[random.Random, Dataset], RequestSpec]] = {
+    "board_load": board_load,
+    "task_list": task_list,
+    "task_update": task_update,
+    "log_listing": log_listing,
+    "login": login,
+}
+
+
+class BenchmarkRunner:
+    """Гоняет сценарии через реальное ASGI-приложение in-process, без сети и отдельного сервера."""
+
+    def __init__(self, app, dataset: Dataset, config: RunConfig):
+        self.app = app
+        self.dataset = dataset
+        self.config = config
+        self.tokens: dict[str, str] = {}
+
+    async def _send(self, client: httpx.AsyncClient, spec: RequestSpec) -> tuple[float, bool]:
+        method, path, params, body, email = spec
+        headers = {"Authorization": f"Bearer {self.tokens[email]}"} if email else None
+        started = time.perf_counter()
+        response = await client.request(method, path, params=params, json=body, headers=headers)
+        return time.perf_counter() - started, response.status_code < 400
+
+    async def _drive(self, client: httpx.AsyncClient, specs: list[RequestSpec]) -> tuple[list[float], int, float]:
+        latencies: list[float] = []
+        errors = 0
+        queue = iter(specs)
+
+        async def worker():
+            nonlocal errors
+            for spec in queue:
+                latency, ok = await self._send(client, spec)
+                latencies.append(latency)
+                errors += not ok
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.config.concurrency)))
+        return latencies, errors, time.perf_counter() - started
+
+    async def run_scenario(self, client: httpx.AsyncClient, name: str) -> ScenarioResult:
+        # у каждого сценария свой seed: результаты не зависят от набора и порядка сценариев
+        rng = random.Random(f"{self.config.seed}:{name}")
+        count = self.config.login_requests if name == "login" else self.config.requests
+        make = SCENARIOS[name]
+        specs = [make(rng, self.dataset) for _ in range(self.config.warmup + count)]
+        await self._drive(client, specs[:self.config.warmup])
+
+        latencies, errors, elapsed = await self._drive(client, specs[self.config.warmup:])
+        latencies.sort()
+        return ScenarioResult(
+            requests=len(latencies),
+            errors=errors,
+            p50_ms=round(percentile(latencies, 50) * 1000, 3),
+            p95_ms=round(percentile(latencies, 95) * 1000, 3),
+            p99_ms=round(percentile(latencies, 99) * 1000, 3),
+            mean_ms=round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            max_ms=round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            throughput_rps=round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        )
+
+    async def run(self, scenarios: list[str]) -> dict[str, ScenarioResult]:
+        transport = httpx.ASGITransport(app=self.app)
+        # ASGITransport не шлет lifespan-события: фоновые задачи приложения запускаются вручную
+        async with self.app.router.lifespan_context(self.app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                # токены выписываются напрямую: bcrypt при подготовке исказил бы только сценарий login
+                for project in self.dataset.projects:
+                    self.tokens[project.owner_email] = create_access_token(data={"sub": str(project.owner_id)})
+                return {name: await self.run_scenario(client, name) for name in scenarios}
@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+from uuid import UUID
+
+from src.core.database import AsyncSessionLocal, engine
+from src.crud.importer import import_records, parse_records
+
+
+async def read_lines(path: str):
+    with open(path, encoding="utf-8", newline="") as file:
+        for line in file:
+            yield line
+
+
+async def import_file(path: str, format: str, owner_id: UUID | None):
+    async with AsyncSessionLocal() as session:
+        report = await import_records(session, parse_records(read_lines(path), format), owner_id=owner_id)
+    await engine.dispose()
+    print(report.model_dump_json(indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import projects, columns, tasks and logs via COPY")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["ndjson", "csv"])
+    parser.add_argument("--owner-id", type=UUID, help="user added to every imported project")
+    args = parser.parse_args()
+
+    format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    report = asyncio.run(import_file(args.path, format, args.owner_id))
+    raise SystemExit(0 if report.committed else 1)
@@ -0,0 +1,23 @@
+import argparse
+import asyncio
+
+from src.settings import settings
+from src.core.database import engine
+from src.crud.log_retention import maintain_log_partitions
+
+
+async def maintain(days: int | None, months_ahead: int, mode: str):
+    created, expired = await maintain_log_partitions(days, months_ahead, mode)
+    await engine.dispose()
+    print(f"Created partitions: {', '.join(created) or '-'}")
+    print(f"Expired partitions ({mode}): {', '.join(expired) or '-'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create upcoming task_logs partitions and expire old ones")
+    parser.add_argument("--days", type=int, default=settings.LOG_RETENTION_DAYS)
+    parser.add_argument("--months-ahead", type=int, default=settings.LOG_PARTITIONS_AHEAD)
+    parser.add_argument("--mode", choices=["archive", "drop"], default=settings.LOG_EXPIRED_PARTITIONS)
+    args = parser.parse_args()
+
+    asyncio.run(maintain(args.days, args.months_ahead, args.mode))
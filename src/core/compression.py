@@ -0,0 +1,121 @@
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.settings import settings
+from src.core.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# сжатые тела ответов с ETag: одна версия доски сжимается один раз на процесс
+compressed_cache = TTLCache(settings.COMPRESSION_CACHE_SIZE, settings.COMPRESSION_CACHE_TTL, name="compressed_bodies")
+
+
+def accepted_encodings(header: str) -> set[str]:
+    # кодировки с q=0 клиент явно отклоняет
+    encodings = set()
+    for part in header.split(","):
+        token, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token.strip() and quality > 0:
+            encodings.add(token.strip().lower())
+    return encodings
+
+
+def choose_encoding(header: str) -> str | None:
+    encodings = accepted_encodings(header)
+    if brotli is not None and "br" in encodings:
+        return "br"
+    if "gzip" in encodings:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """Сжимает ответы gzip/brotli начиная с COMPRESSION_MIN_SIZE байт.
+
+    Потоковые ответы (SSE, экспорт) проходят без изменений: буферизовать их нельзя.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            if message.get("more_body", False):
+                await send(start)
+                await send(message)
+                return
+            await self._send_compressed(scope, encoding, start, message, send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_compressed(self, scope, encoding, start, message, send):
+        headers = MutableHeaders(raw=start["headers"])
+        body = message.get("body", b"")
+        content_type = headers.get("content-type", "")
+        if (
+            start["status"] < 200 or start["status"] in (204, 304)
+            or "content-encoding" in headers
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+        ):
+            await send(start)
+            await send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if len(body) < settings.COMPRESSION_MIN_SIZE:
+            await send(start)
+            await send(message)
+            return
+
+        # ETag меняется вместе с версией данных, поэтому годится ключом кэша
+        etag = headers.get("etag")
+        key = (scope["path"], scope["query_string"], etag, encoding) if etag and start["status"] == 200 else None
+        compressed = compressed_cache.get(key) if key else None
+        if compressed is None:
+            compressed = compress(body, encoding)
+            if key:
+                compressed_cache.set(key, compressed)
+
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(compressed))
+        await send(start)
+        await send({"type": "http.response.body", "body": compressed})
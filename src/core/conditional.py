@@ -0,0 +1,48 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+from fastapi import Request, Response
+
+
+def make_etag(state: tuple, *variant) -> str:
+    # слабый ETag: одинаковая версия данных дает семантически одинаковый ответ
+    digest = hashlib.blake2b(repr((state, variant)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def last_modified(state: tuple) -> datetime | None:
+    return max((value for value in state if isinstance(value, datetime)), default=None)
+
+
+def http_date(value: datetime) -> str:
+    # метки времени в базе хранятся naive в UTC
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match сравнивается слабо: префикс W/ не учитывается
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def not_modified(request: Request, response: Response, state: tuple | None, *variant) -> Response | None:
+    """Ставит ETag/Last-Modified и возвращает 304, если версия клиента актуальна.
+
+    state=None (ресурс не найден) пропускается: обычный обработчик ответит 404.
+    """
+    if state is None:
+        return None
+    headers = {"ETag": make_etag(state, *variant), "Cache-Control": "no-cache"}
+    modified = last_modified(state)
+    if modified is not None:
+        headers["Last-Modified"] = http_date(modified)
+
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -1,11 +1,105 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from src.settings import settings
+from src.core.metrics import DB_POOL_WAIT, DB_QUERY_DURATION, refresh_callbacks, set_pool_gauges
+
+
+class PoolWaitStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        DB_POOL_WAIT.observe(wait)
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    # время ожидания соединения из пула (включая открытие нового соединения)
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait_stats.record(time.perf_counter() - start)
+
+
+class QueryStats:
+    # SQL одного запроса к API: количество, время в БД, строки и повторы одинаковых выражений
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.rows = 0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float, rows: int) -> None:
+        self.count += 1
+        self.duration += duration
+        self.rows += rows
+        self.statements[statement] += 1
+
+    def most_repeated(self) -> tuple[str, int]:
+        # один и тот же SQL много раз за запрос - типичный признак N+1
+        return self.statements.most_common(1)[0] if self.statements else ("", 0)
+
+
+# статистика текущего запроса; задает QueryStatsMiddleware, вне запроса None
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_started_at = time.perf_counter()
 
-engine = create_async_engine(
-    url = settings.DATABASE_URL_asyncpg,
-    echo = True
-)
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - context.query_started_at
+    DB_QUERY_DURATION.observe(duration)
+    stats = current_query_stats.get()
+    if stats is None:
+        return
+    # asyncpg-адаптер не знает rowcount для SELECT, но держит выбранные строки в буфере курсора
+    rows = cursor.rowcount if cursor.rowcount >= 0 else len(getattr(cursor, "_rows", ()))
+    stats.record(statement, duration, rows)
+
+
+def _connect_args() -> dict:
+    connect_args = {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    return connect_args
+
+
+def _create_engine(url: str):
+    async_engine = create_async_engine(
+        url = url,
+        echo = settings.db_echo,
+        poolclass = InstrumentedQueuePool,
+        pool_size = settings.db_pool_size,
+        max_overflow = settings.db_max_overflow,
+        pool_timeout = settings.DB_POOL_TIMEOUT,
+        pool_recycle = settings.DB_POOL_RECYCLE,
+        pool_pre_ping = settings.DB_POOL_PRE_PING,
+        connect_args = _connect_args()
+    )
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(async_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return async_engine
+
+
+engine = _create_engine(settings.DATABASE_URL_asyncpg)
+# у каждой реплики свой пул того же размера: лимит DB_MAX_CONNECTIONS считается на сервер
+replica_engines = [_create_engine(url) for url in settings.db_replica_urls]
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -17,4 +111,32 @@ async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
 
+
+def _pool_usage(pool) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0)
+    }
+
+
+def get_pool_stats() -> dict:
+    return {
+        **_pool_usage(engine.pool),
+        "checkouts": pool_wait_stats.checkouts,
+        "wait_seconds_total": pool_wait_stats.total_wait,
+        "wait_seconds_max": pool_wait_stats.max_wait,
+        "replicas": [_pool_usage(replica.pool) for replica in replica_engines]
+    }
+
+
+def _refresh_pool_metrics() -> None:
+    set_pool_gauges("primary", _pool_usage(engine.pool))
+    for index, replica in enumerate(replica_engines):
+        set_pool_gauges(f"replica{index}", _pool_usage(replica.pool))
+
+
+refresh_callbacks.append(_refresh_pool_metrics)
+
 Base = declarative_base()
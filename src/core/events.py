@@ -0,0 +1,127 @@
+import asyncio
+import json
+import logging
+from uuid import UUID
+
+import asyncpg
+
+from src.settings import settings
+
+# все проекты публикуются в один канал, воркер фильтрует события по project_id в памяти
+EVENTS_CHANNEL = "board_events"
+RESYNC_EVENT = {"type": "resync"}
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    def __init__(self, project_id: UUID, maxsize: int):
+        self.project_id = project_id
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def push(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # медленный клиент не тормозит остальных: очередь сбрасывается,
+            # а клиент получает resync и перечитывает доску целиком
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class EventHub:
+    """Один LISTEN на воркер, события раздаются подписчикам через ограниченные очереди."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscriptions: dict[UUID, set[Subscription]] = {}
+        self._connection: asyncpg.Connection | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def subscribe(self, project_id: UUID) -> Subscription:
+        subscription = Subscription(project_id, self.queue_size)
+        self._subscriptions.setdefault(project_id, set()).add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.project_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.project_id]
+
+    def _dispatch(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            project_id = UUID(event.pop("project_id"))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Malformed board event: %s", payload)
+            return
+        for subscription in self._subscriptions.get(project_id, ()):
+            subscription.push(event)
+
+    def _broadcast(self, event: dict) -> None:
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.push(event)
+
+    async def _listen(self) -> None:
+        delay = RECONNECT_DELAY
+        while self._subscriptions:
+            closed = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(
+                    host=settings.DB_HOST,
+                    port=settings.DB_PORT,
+                    user=settings.DB_USERNAME,
+                    password=settings.DB_PASSWORD,
+                    database=settings.DB_NAME
+                )
+                self._connection.add_termination_listener(lambda connection: closed.set())
+                await self._connection.add_listener(EVENTS_CHANNEL, self._dispatch)
+                delay = RECONNECT_DELAY
+                await closed.wait()
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Board event listener failed: %s", e)
+            except Exception:
+                # любая другая ошибка (InterfaceError и т.п.) тоже ведет к переподключению:
+                # задача не должна завершаться, пока есть подписчики; CancelledError сюда не попадает
+                logger.exception("Board event listener crashed")
+            finally:
+                if self._connection is not None and not self._connection.is_closed():
+                    try:
+                        await self._connection.close()
+                    except Exception:
+                        self._connection.terminate()
+                self._connection = None
+            # пока соединения не было, события могли потеряться
+            self._broadcast(RESYNC_EVENT)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+event_hub = EventHub(settings.EVENTS_QUEUE_SIZE)
@@ -0,0 +1,53 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from passlib.context import CryptContext
+
+from src.settings import settings
+from src.core.metrics import HASHING_QUEUE_DEPTH
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+_executor: Executor | None = None
+_semaphore = asyncio.Semaphore(settings.HASH_CONCURRENCY)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return pwd_context.verify(password, hashed)
+
+
+def get_hashing_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.HASH_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.HASH_WORKERS)
+        else:
+            # bcrypt отпускает GIL, поэтому потоков достаточно для параллельного хэширования
+            _executor = ThreadPoolExecutor(max_workers=settings.HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _executor
+
+
+async def _run(func, *args):
+    # семафор ограничивает число одновременных хэширований, чтобы всплеск логинов не съел весь CPU
+    with HASHING_QUEUE_DEPTH.track_inprogress():
+        async with _semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(get_hashing_executor(), func, *args)
+
+
+async def hash_password(password: str) -> str:
+    return await _run(_hash, password)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _run(_verify, password, hashed)
+
+
+def shutdown_hashing_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -0,0 +1,20 @@
+from typing import Optional
+from fastapi import HTTPException, Query, status
+
+TASK_INCLUDES = frozenset({"logs", "users"})
+
+
+def task_include(
+        include: Optional[str] = Query(None, description="Comma-separated task expansions: logs, users")
+) -> frozenset[str]:
+    if not include:
+        return frozenset()
+
+    requested = frozenset(part.strip() for part in include.split(",") if part.strip())
+    unknown = requested - TASK_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}"
+        )
+    return requested
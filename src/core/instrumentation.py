@@ -0,0 +1,94 @@
+import json
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+
+from src.settings import settings
+from src.core.database import QueryStats, current_query_stats
+from src.core.metrics import REQUEST_QUERIES, route_path
+
+logger = logging.getLogger(__name__)
+
+
+def route_key(scope) -> str:
+    # шаблон пути, а не сам путь: "GET /tasks/{task_id}"
+    return f"{scope['method']} {route_path(scope)}"
+
+
+def query_budget(key: str) -> int | None:
+    return settings.QUERY_BUDGETS.get(key, settings.QUERY_BUDGET_DEFAULT)
+
+
+def server_timing(stats: QueryStats, total: float) -> str:
+    return (
+        f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries, {stats.rows} rows", '
+        f"total;dur={total * 1000:.1f}"
+    )
+
+
+class QueryStatsMiddleware:
+    """Считает SQL каждого запроса: заголовок Server-Timing и строка лога на запрос.
+
+    В тестовом режиме (SERVER_TEST) ответ, превысивший бюджет запросов маршрута, заменяется на 500.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+        over_budget = False
+
+        async def send_wrapper(message):
+            nonlocal status, over_budget
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                budget = query_budget(route_key(scope))
+                if settings.SERVER_TEST and budget is not None and stats.count > budget:
+                    over_budget, status = True, 500
+                    await self._send_budget_error(send, scope, stats, budget)
+                    return
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(stats, time.perf_counter() - started))
+            elif over_budget:
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            self._log(scope, status, stats, time.perf_counter() - started)
+
+    @staticmethod
+    async def _send_budget_error(send, scope, stats: QueryStats, budget: int) -> None:
+        statement, repeats = stats.most_repeated()
+        body = json.dumps({
+            "detail": f"Query budget exceeded for {route_key(scope)}: {stats.count} > {budget}",
+            "most_repeated": {"statement": statement, "count": repeats},
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 500,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _log(scope, status: int, stats: QueryStats, total: float) -> None:
+        statement, repeats = stats.most_repeated()
+        REQUEST_QUERIES.labels(scope["method"], route_path(scope)).observe(stats.count)
+        logger.info(
+            "request route=%r status=%d queries=%d rows=%d db_ms=%.1f total_ms=%.1f max_repeats=%d",
+            route_key(scope), status, stats.count, stats.rows, stats.duration * 1000, total * 1000, repeats
+        )
+        if repeats >= settings.QUERY_REPEAT_WARNING:
+            logger.warning("Possible N+1 in %s: statement repeated %d times: %s", route_key(scope), repeats, statement)
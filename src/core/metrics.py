@@ -0,0 +1,98 @@
+import os
+import time
+from typing import Callable
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+)
+
+# с несколькими воркерами uvicorn значения пишутся в файлы PROMETHEUS_MULTIPROC_DIR
+# (задается в src.main.run до запуска воркеров) и суммируются при выдаче /metrics
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled", ["method"], multiprocess_mode="livesum"
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements per HTTP request", ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+)
+DB_QUERY_DURATION = Histogram("db_query_duration_seconds", "SQL statement execution time")
+DB_POOL_WAIT = Histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection")
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "Connections in the pool by state", ["engine", "state"], multiprocess_mode="livesum"
+)
+HASHING_QUEUE_DEPTH = Gauge(
+    "password_hashing_queue_depth", "bcrypt operations waiting or running", multiprocess_mode="livesum"
+)
+CACHE_REQUESTS = Counter("cache_requests_total", "In-process cache lookups", ["cache", "result"])
+
+# обновляют gauge-снимки состояния (пулы соединений); вызываются после каждого запроса и при выдаче /metrics
+refresh_callbacks: list[Callable[[], None]] = []
+
+
+def refresh_gauges() -> None:
+    for callback in refresh_callbacks:
+        callback()
+
+
+def route_path(scope) -> str:
+    # шаблон пути вместо самого пути: иначе каждый id порождает новую серию
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+def set_pool_gauges(name: str, usage: dict) -> None:
+    for state in ("checked_in", "checked_out", "overflow"):
+        DB_POOL_CONNECTIONS.labels(name, state).set(usage[state])
+
+
+def render_metrics() -> tuple[bytes, str]:
+    refresh_gauges()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    # live-gauge завершившегося воркера не должны суммироваться с живыми
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """Гистограмма латентности по шаблону маршрута и число запросов в обработке."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            refresh_gauges()
+            REQUEST_DURATION.labels(method, route_path(scope), str(status)).observe(time.perf_counter() - started)
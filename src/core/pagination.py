@@ -0,0 +1,134 @@
+import base64
+import json
+import math
+from datetime import datetime
+from typing import Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, or_, tuple_, false
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps([
+        value.isoformat() if isinstance(value, datetime) else str(value) if isinstance(value, UUID) else value
+        for value in values
+    ])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _coerce(value, column):
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+    # курсор приходит от клиента: JSON-тип значения должен совпадать с тем, что пишет encode_cursor
+    if python_type is int:
+        expected = isinstance(value, int) and not isinstance(value, bool)
+    elif python_type is float:
+        expected = isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+    elif python_type is None:
+        expected = isinstance(value, (str, int, float))
+    else:
+        expected = isinstance(value, str)
+    if not expected:
+        raise TypeError(value)
+    if python_type is None:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [_coerce(value, column) for value, column in zip(values, columns)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _nullable(column) -> bool:
+    return getattr(getattr(column, "expression", column), "nullable", False)
+
+
+def _order_clause(column, descending: bool):
+    # порядок NULL как у Postgres по умолчанию (ASC NULLS LAST, DESC NULLS FIRST), но явно:
+    # keyset_condition опирается именно на него, а индексы по-прежнему подходят
+    clause = column.desc() if descending else column.asc()
+    if _nullable(column):
+        clause = clause.nulls_first() if descending else clause.nulls_last()
+    return clause
+
+
+def _after(column, descending: bool, value):
+    # строки строго после value по этому ключу; None - таких строк нет
+    if value is None:
+        return column.is_not(None) if descending else None
+    if descending:
+        return column < value
+    if _nullable(column):
+        return or_(column > value, column.is_(None))
+    return column > value
+
+
+def keyset_condition(order: Sequence[tuple], values: Sequence):
+    directions = {descending for _, descending in order}
+    nullable = None in values or any(_nullable(column) for column, _ in order)
+    if len(directions) == 1 and not nullable:
+        # одно направление сортировки -> сравнение кортежей, которое использует составной индекс
+        left = tuple_(*(column for column, _ in order))
+        right = tuple_(*values)
+        return left < right if directions.pop() else left > right
+
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        after = _after(column, descending, values[i])
+        if after is None:
+            continue
+        prefix = [
+            prev.is_(None) if value is None else prev == value
+            for (prev, _), value in zip(order[:i], values[:i])
+        ]
+        clauses.append(and_(*prefix, after))
+    return or_(*clauses) if clauses else false()
+
+
+async def paginate(
+        session: AsyncSession,
+        query: Select,
+        order: Sequence[tuple],
+        limit: int,
+        cursor: Optional[str] = None,
+        mappings: bool = False
+) -> tuple[list, str | None]:
+    # order: [(колонка, desc?)], последним ключом должен идти уникальный id
+    # mappings=True: query выбирает колонки, элементы страницы - словари без ORM-объектов
+    if cursor:
+        values = decode_cursor(cursor, [column for column, _ in order])
+        query = query.where(keyset_condition(order, values))
+
+    query = query.order_by(*(_order_clause(column, descending) for column, descending in order)).limit(limit + 1)
+
+    result = await session.execute(query)
+    if mappings:
+        items = [dict(row) for row in result.mappings()]
+    else:
+        items = list(result.scalars().all())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([
+            last[column.key] if mappings else getattr(last, column.key) for column, _ in order
+        ])
+    return items, next_cursor
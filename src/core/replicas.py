@@ -0,0 +1,112 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from fastapi import Depends
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine
+
+from src.settings import settings
+from src.core.cache import TTLCache
+from src.core.database import AsyncSessionLocal, replica_engines
+from src.core.jwt_utils import decode_access_token
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# пользователи, недавно писавшие в primary: их чтения не уходят на отстающую реплику
+recent_writers = TTLCache(maxsize=65536, ttl=settings.DB_REPLICA_STICKY_SECONDS, name="recent_writers")
+
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+
+class ReplicaSet:
+    def __init__(self, engines: list[AsyncEngine], retry_after: float):
+        self.engines = engines
+        self.retry_after = retry_after
+        self._down_until: dict[AsyncEngine, float] = {}
+        self._next = 0
+
+    def pick(self) -> AsyncEngine | None:
+        # round-robin по репликам, помеченные недоступными пропускаются до истечения retry_after
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            engine = self.engines[self._next % len(self.engines)]
+            self._next += 1
+            if self._down_until.get(engine, 0) <= now:
+                return engine
+        return None
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        self._down_until[engine] = time.monotonic() + self.retry_after
+
+
+replica_set = ReplicaSet(replica_engines, settings.DB_REPLICA_RETRY_SECONDS)
+
+
+def token_user_id(token: Optional[str]) -> UUID | None:
+    payload = decode_access_token(token) if token else None
+    try:
+        return UUID(payload["sub"]) if payload else None
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def mark_write(user_id: UUID | None) -> None:
+    if user_id is not None:
+        recent_writers.set(user_id, True)
+
+
+@asynccontextmanager
+async def open_read_session(user_id: UUID | None = None) -> AsyncIterator[AsyncSession]:
+    sticky = user_id is not None and recent_writers.get(user_id) is not None
+    for _ in range(0 if sticky else len(replica_set.engines)):
+        engine = replica_set.pick()
+        if engine is None:
+            break
+        session = AsyncSession(bind=engine, expire_on_commit=False)
+        try:
+            # соединение берется сразу: недоступная реплика обнаруживается до запроса обработчика
+            await session.connection()
+        except (OSError, DBAPIError, asyncio.TimeoutError):
+            await session.close()
+            replica_set.mark_down(engine)
+            continue
+        try:
+            yield session
+        finally:
+            await session.close()
+        return
+
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_read_db(token: Optional[str] = Depends(optional_oauth2_scheme)):
+    async with open_read_session(token_user_id(token)) as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """После успешного изменяющего запроса закрепляет чтения пользователя за primary."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not replica_set.engines:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = dict(scope["headers"])
+                authorization = headers.get(b"authorization", b"").decode("latin-1")
+                scheme, _, token = authorization.partition(" ")
+                if scheme.lower() == "bearer":
+                    mark_write(token_user_id(token))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
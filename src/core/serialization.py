@@ -0,0 +1,35 @@
+from typing import Any, Iterable
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dump_json(content: Any) -> bytes:
+    # orjson и pydantic-core одинаково кодируют UUID и datetime без часового пояса
+    if orjson is not None:
+        return orjson.dumps(content)
+    return to_json(content)
+
+
+def row_columns(model, schema: type[BaseModel], exclude: Iterable[str] = ()) -> list:
+    # колонки модели в порядке полей схемы: строки выборки сразу совпадают с ответом
+    return [getattr(model, name) for name in schema.model_fields if name not in exclude]
+
+
+class FastJSONResponse(JSONResponse):
+    """Ответ из доверенных данных БД: без валидации response_model и повторного кодирования."""
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+class RawJSONResponse(Response):
+    """Ответ, JSON которого уже собран (например, самим Postgres)."""
+
+    media_type = "application/json"
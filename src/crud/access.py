@@ -0,0 +1,61 @@
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.settings import settings
+from src.core.cache import TTLCache
+from src.models.models import BColumn, ProjectUser, Task
+from src.crud.events import column_projects
+
+OWNER = "owner"
+MEMBER = "member"
+ROLE_LEVELS = {MEMBER: 1, OWNER: 2}
+
+# {project_id: role} пользователя; сбрасывается при изменении его членства в проектах
+project_roles = TTLCache(settings.ACCESS_CACHE_SIZE, settings.ACCESS_CACHE_TTL, name="project_roles")
+
+
+async def get_project_roles(session: AsyncSession, user_id: UUID, fresh: bool = False) -> dict[UUID, str]:
+    roles = None if fresh else project_roles.get(user_id)
+    if roles is None:
+        # ix_project_users_user_id: все проекты пользователя одним индексным запросом
+        result = await session.execute(
+            select(ProjectUser.project_id, ProjectUser.role).where(ProjectUser.user_id == user_id)
+        )
+        roles = dict(result.all())
+        project_roles.set(user_id, roles)
+    return roles
+
+
+def invalidate_project_roles(user_id: UUID) -> None:
+    project_roles.invalidate(user_id)
+
+
+async def get_column_project_ids(session: AsyncSession, column_ids: Iterable[UUID]) -> dict[UUID, UUID]:
+    # колонка не переезжает между проектами, поэтому соответствие кэшируется надолго
+    found = {}
+    missing = []
+    for column_id in set(column_ids):
+        project_id = column_projects.get(column_id)
+        if project_id is None:
+            missing.append(column_id)
+        else:
+            found[column_id] = project_id
+    if missing:
+        result = await session.execute(select(BColumn.id, BColumn.project_id).where(BColumn.id.in_(missing)))
+        for column_id, project_id in result.all():
+            column_projects.set(column_id, project_id)
+            found[column_id] = project_id
+    return found
+
+
+async def get_task_project_ids(session: AsyncSession, task_ids: Iterable[UUID]) -> dict[UUID, UUID]:
+    # задача может перейти в колонку другого проекта, поэтому проект задачи не кэшируется
+    result = await session.execute(
+        select(Task.id, BColumn.project_id)
+        .join(BColumn, BColumn.id == Task.column_id)
+        .where(Task.id.in_(set(task_ids)))
+    )
+    return dict(result.all())
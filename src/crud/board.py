@@ -0,0 +1,101 @@
+from uuid import UUID
+from sqlalchemy import select, func, literal_column, Text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Project, BColumn, Task, TaskAssignee, User
+
+EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+def json_object(type_=None, **fields):
+    # ключи рендерятся литералами: asyncpg не может вывести тип параметра для VARIADIC "any"
+    args = []
+    for key, value in fields.items():
+        args.extend((literal_column(f"'{key}'"), value))
+    return func.json_build_object(*args, type_=type_)
+
+
+def _user_json():
+    return json_object(
+        id=User.id,
+        username=User.username,
+        description=User.description,
+        email=User.email,
+        created_at=User.created_at,
+        last_updated_at=User.last_updated_at
+    )
+
+
+def build_board_query(project_id: UUID):
+    # вся доска собирается одним запросом: исполнители -> задачи -> колонки -> проект
+    assignees = (
+        select(
+            TaskAssignee.task_id,
+            func.json_agg(aggregate_order_by(_user_json(), User.username)).label("users")
+        )
+        .join(User, User.id == TaskAssignee.user_id)
+        .join(Task, Task.id == TaskAssignee.task_id)
+        .join(BColumn, BColumn.id == Task.column_id)
+        .where(BColumn.project_id == project_id)
+        .group_by(TaskAssignee.task_id)
+        .cte("board_assignees")
+    )
+
+    task_json = json_object(
+        id=Task.id,
+        column_id=Task.column_id,
+        order=Task.order,
+        title=Task.title,
+        description=Task.description,
+        status=Task.status,
+        priority=Task.priority,
+        created_at=Task.created_at,
+        last_updated_at=Task.last_updated_at,
+        users=func.coalesce(assignees.c.users, EMPTY_JSON_ARRAY)
+    )
+    tasks = (
+        select(
+            Task.column_id,
+            func.json_agg(aggregate_order_by(task_json, Task.order)).label("tasks")
+        )
+        .join(BColumn, BColumn.id == Task.column_id)
+        .outerjoin(assignees, assignees.c.task_id == Task.id)
+        .where(BColumn.project_id == project_id)
+        .group_by(Task.column_id)
+        .cte("board_tasks")
+    )
+
+    column_json = json_object(
+        id=BColumn.id,
+        project_id=BColumn.project_id,
+        name=BColumn.name,
+        description=BColumn.description,
+        order=BColumn.order,
+        created_at=BColumn.created_at,
+        last_updated_at=BColumn.last_updated_at,
+        tasks=func.coalesce(tasks.c.tasks, EMPTY_JSON_ARRAY)
+    )
+    columns = (
+        select(func.json_agg(aggregate_order_by(column_json, BColumn.order)))
+        .outerjoin(tasks, tasks.c.column_id == BColumn.id)
+        .where(BColumn.project_id == project_id)
+        .scalar_subquery()
+    )
+
+    return select(
+        json_object(
+            id=Project.id,
+            name=Project.name,
+            description=Project.description,
+            created_at=Project.created_at,
+            last_updated_at=Project.last_updated_at,
+            columns=func.coalesce(columns, EMPTY_JSON_ARRAY),
+            type_=Text
+        )
+    ).where(Project.id == project_id)
+
+
+async def get_project_board(session: AsyncSession, project_id: UUID) -> str | None:
+    result = await session.execute(build_board_query(project_id))
+    return result.scalar_one_or_none()
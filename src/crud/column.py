@@ -1,111 +1,137 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, update
-from src.models.models import BColumn, Task
-from src.schemas.column import ColumnCreate, ColumnUpdate
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from src.models.models import BColumn
+from src.schemas.column import ColumnCreate, ColumnUpdate, ColumnMove
+from src.crud.task import task_load_options, attach_log_stats, not_null_update
+from src.crud.ordering import add_with_order, order_after, is_order_conflict, is_missing_reference, MissingReference
+from src.crud.events import publish_column_event, column_projects
+from src.core.includes import TASK_INCLUDES
 from sqlalchemy.orm import selectinload
 
 
 async def create_column(session: AsyncSession, column_data: ColumnCreate) -> BColumn:
-    if column_data.order is not None:
-        existing_column = await session.execute(
-            select(BColumn)
-            .where(BColumn.project_id == column_data.project_id)
-            .where(BColumn.order == column_data.order)
-        )
-        if existing_column.scalar_one_or_none() is not None:
-            raise ValueError(f"Column with order {column_data.order} already exists in this project")
-    if column_data.order is None:
-        max_order_result = await session.execute(
-            select(func.max(BColumn.order))
-            .where(BColumn.project_id == column_data.project_id)
-        )
-        column_data.order = (max_order_result.scalar() or 0) + 1
     new_column = BColumn(
         id=uuid4(),
         name=column_data.name,
-        description=column_data.description,
+        description=column_data.description or "",
         project_id=column_data.project_id,
         order=column_data.order,
         created_at=datetime.utcnow(),
         last_updated_at=datetime.utcnow()
     )
-    session.add(new_column)
-    await session.commit()
-    await session.refresh(new_column)
-    return new_column
+    try:
+        if column_data.order is None:
+            await add_with_order(session, new_column, BColumn.project_id, column_data.project_id)
+        else:
+            session.add(new_column)
+        await publish_column_event(session, "column.created", new_column)
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if is_order_conflict(e):
+            raise ValueError("Column order is already taken in this project")
+        if is_missing_reference(e):
+            raise MissingReference("Project does not exist")
+        raise
+    return await get_column_by_id(session, new_column.id)
+
+
+def column_load_options(include: frozenset[str] = frozenset()) -> list:
+    return [selectinload(BColumn.tasks).options(*task_load_options(include))]
 
 
-async def get_column_by_id(session: AsyncSession, column_id: UUID) -> BColumn | None:
+async def get_column_by_id(
+        session: AsyncSession,
+        column_id: UUID,
+        include: frozenset[str] = frozenset(),
+        with_stats: bool = True
+) -> BColumn | None:
     result = await session.execute(
         select(BColumn)
         .where(BColumn.id == column_id)
-        .options(
-            selectinload(BColumn.tasks).selectinload(Task.users),
-            selectinload(BColumn.tasks).selectinload(Task.logs)
-        )
+        .options(*column_load_options(include))
+        .execution_options(populate_existing=True)
     )
-    return result.scalar_one_or_none()
+    column = result.scalar_one_or_none()
+    if column is not None and with_stats:
+        await attach_log_stats(session, column.tasks, include)
+    return column
 
 
-async def get_columns_by_project(session: AsyncSession, project_id: UUID) -> list[BColumn]:
+async def get_columns_by_project(
+        session: AsyncSession,
+        project_id: UUID,
+        include: frozenset[str] = frozenset()
+) -> list[BColumn]:
     result = await session.execute(
         select(BColumn)
         .where(BColumn.project_id == project_id)
         .order_by(BColumn.order)
-        .options(
-            selectinload(BColumn.tasks).selectinload(Task.users),
-            selectinload(BColumn.tasks).selectinload(Task.logs)
-        )
+        .options(*column_load_options(include))
     )
-    return result.scalars().all()
+    columns = result.scalars().all()
+    await attach_log_stats(session, [task for column in columns for task in column.tasks], include)
+    return columns
 
 
-async def update_column(session: AsyncSession, column_id: UUID, column_data: ColumnUpdate) -> BColumn | None:
-    result = await session.execute(
-        select(BColumn)
-        .where(BColumn.id == column_id)
-        .options(
-            selectinload(BColumn.tasks).selectinload(Task.users),
-            selectinload(BColumn.tasks).selectinload(Task.logs)
-        )
-    )
+async def update_column(
+        session: AsyncSession,
+        column_id: UUID,
+        column_data: ColumnUpdate,
+        include: frozenset[str] = frozenset()
+) -> BColumn | None:
+    result = await session.execute(select(BColumn).where(BColumn.id == column_id))
     column = result.scalar_one_or_none()
     if not column:
         return None
 
-    if column_data.order is not None and column_data.order != column.order:
-        existing_column = await session.execute(
-            select(BColumn)
-            .where(BColumn.project_id == column.project_id)
-            .where(BColumn.order == column_data.order)
-            .where(BColumn.id != column_id)
-        )
-
-        if existing_column.scalar_one_or_none() is not None:
-            raise ValueError(f"Column with order {column_data.order} already exists in this project")
-
-    for key, value in column_data.model_dump(exclude_unset=True).items():
+    for key, value in not_null_update(column_data.model_dump(exclude_unset=True)).items():
         setattr(column, key, value)
 
     column.last_updated_at = datetime.utcnow();
-    await session.commit()
-    await session.refresh(column)
-    return column
+    try:
+        await publish_column_event(session, "column.updated", column)
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise ValueError(f"Column with order {column_data.order} already exists in this project")
+    return await get_column_by_id(session, column_id, include)
+
+
+async def move_column(
+        session: AsyncSession,
+        column_id: UUID,
+        move: ColumnMove,
+        include: frozenset[str] = frozenset()
+) -> BColumn | None:
+    result = await session.execute(select(BColumn).where(BColumn.id == column_id))
+    column = result.scalar_one_or_none()
+    if not column:
+        return None
+
+    column.order = await order_after(
+        session, BColumn, BColumn.project_id, column.project_id, move.after_id, column.id
+    )
+    column.last_updated_at = datetime.utcnow()
+    try:
+        await publish_column_event(session, "column.reordered", column)
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise ValueError("Column order changed concurrently, retry the move")
+    return await get_column_by_id(session, column_id, include)
 
 
 async def delete_column(session: AsyncSession, column_id: UUID) -> bool:
-    column = await get_column_by_id(session, column_id)
+    column = await get_column_by_id(session, column_id, TASK_INCLUDES, with_stats=False)
     if not column:
         return False
+    # промежутки в порядке допустимы, сдвигать остальные колонки не нужно
     await session.delete(column)
+    await publish_column_event(session, "column.deleted", column)
     await session.commit()
-    await session.execute(
-        update(BColumn)
-        .where(BColumn.project_id == column.project_id)
-        .where(BColumn.order > column.order)
-        .values(order=BColumn.order - 1)
-    )
-    await session.commit()
+    column_projects.invalidate(column_id)
     return True
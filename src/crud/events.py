@@ -0,0 +1,61 @@
+import json
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.settings import settings
+from src.core.cache import TTLCache
+from src.core.events import EVENTS_CHANNEL, RESYNC_EVENT
+from src.models.models import BColumn, Task
+
+# колонка не переезжает между проектами, поэтому соответствие можно держать долго
+column_projects = TTLCache(maxsize=4096, ttl=3600, name="column_projects")
+
+
+async def get_column_project_id(session: AsyncSession, column_id: UUID) -> UUID | None:
+    project_id = column_projects.get(column_id)
+    if project_id is None:
+        result = await session.execute(select(BColumn.project_id).where(BColumn.id == column_id))
+        project_id = result.scalar_one_or_none()
+        if project_id is not None:
+            column_projects.set(column_id, project_id)
+    return project_id
+
+
+async def publish(session: AsyncSession, project_id: UUID | None, event_type: str, **data) -> None:
+    # NOTIFY транзакционный: событие уходит подписчикам только после commit
+    if not settings.EVENTS_ENABLED or project_id is None:
+        return
+    payload = json.dumps({"project_id": str(project_id), "type": event_type, **data}, default=str)
+    await session.execute(select(func.pg_notify(EVENTS_CHANNEL, payload)))
+
+
+async def publish_resync(session: AsyncSession, project_ids: Iterable[UUID]) -> None:
+    # пакетные изменения: одно событие на проект вместо события на каждую задачу,
+    # клиенты перечитывают доску так же, как после потерянных событий
+    for project_id in set(project_ids):
+        await publish(session, project_id, RESYNC_EVENT["type"])
+
+
+async def publish_task_event(
+        session: AsyncSession,
+        event_type: str,
+        task_id: UUID,
+        column_id: UUID | None = None,
+        **data
+) -> None:
+    if not settings.EVENTS_ENABLED:
+        return
+    if column_id is None:
+        result = await session.execute(select(Task.column_id).where(Task.id == task_id))
+        column_id = result.scalar_one_or_none()
+        if column_id is None:
+            return
+    project_id = await get_column_project_id(session, column_id)
+    await publish(session, project_id, event_type, id=task_id, column_id=column_id, **data)
+
+
+async def publish_column_event(session: AsyncSession, event_type: str, column: BColumn) -> None:
+    await publish(session, column.project_id, event_type, id=column.id, order=column.order)
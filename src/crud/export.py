@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator
+from uuid import UUID
+
+from sqlalchemy import select, func
+
+from src.core.replicas import open_read_session
+from src.models.models import BColumn, Task, TaskAssignee, TaskLog
+
+EXPORT_BATCH_SIZE = 1000
+
+CSV_FIELDS = [
+    "type", "id", "task_id", "column_id", "title", "description", "status", "priority", "order",
+    "assignee_ids", "message", "created_at", "last_updated_at"
+]
+
+
+def _task_query(project_id: UUID):
+    assignee_ids = (
+        select(func.array_agg(TaskAssignee.user_id))
+        .where(TaskAssignee.task_id == Task.id)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Task.id,
+            Task.column_id,
+            Task.title,
+            Task.description,
+            Task.status,
+            Task.priority,
+            Task.order,
+            assignee_ids.label("assignee_ids"),
+            Task.created_at,
+            Task.last_updated_at
+        )
+        .join(BColumn, BColumn.id == Task.column_id)
+        .where(BColumn.project_id == project_id)
+        .order_by(BColumn.order, Task.order)
+    )
+
+
+def _log_query(project_id: UUID):
+    return (
+        select(TaskLog.id, TaskLog.task_id, TaskLog.message, TaskLog.created_at)
+        .join(Task, Task.id == TaskLog.task_id)
+        .join(BColumn, BColumn.id == Task.column_id)
+        .where(BColumn.project_id == project_id)
+        .order_by(TaskLog.task_id, TaskLog.created_at)
+    )
+
+
+async def iter_project_records(project_id: UUID, user_id: UUID | None = None) -> AsyncIterator[list[dict]]:
+    # отдельная сессия: зависимость get_db закрывается до того, как StreamingResponse дочитает генератор
+    async with open_read_session(user_id) as session:
+        for record_type, query in (("task", _task_query(project_id)), ("log", _log_query(project_id))):
+            # серверный курсор: в памяти держится не больше EXPORT_BATCH_SIZE строк
+            result = await session.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for rows in result.mappings().partitions():
+                yield [_record(record_type, row) for row in rows]
+
+
+def _record(record_type: str, row) -> dict:
+    record = {"type": record_type, **row}
+    if "assignee_ids" in record and record["assignee_ids"] is None:
+        record["assignee_ids"] = []
+    return record
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    return value
+
+
+async def export_ndjson(project_id: UUID, user_id: UUID | None = None) -> AsyncIterator[str]:
+    async for records in iter_project_records(project_id, user_id):
+        yield "".join(json.dumps(record, default=_json_default) + "\n" for record in records)
+
+
+async def export_csv(project_id: UUID, user_id: UUID | None = None) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    async for records in iter_project_records(project_id, user_id):
+        writer.writerows({key: _csv_value(value) for key, value in record.items()} for record in records)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -0,0 +1,285 @@
+import csv
+import json
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+from uuid import UUID, uuid4
+
+import asyncpg
+from pydantic import ValidationError
+from sqlalchemy import select, func
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.settings import settings
+from src.models.models import BColumn, Task
+from src.schemas.board_import import (
+    ImportedProject, ImportedColumn, ImportedTask, ImportedLog, ImportRowError, ImportReport
+)
+from src.crud.ordering import ORDER_GAP
+from src.crud.access import (
+    OWNER, get_project_roles, invalidate_project_roles, get_column_project_ids, get_task_project_ids
+)
+from src.crud.events import publish_resync
+
+IMPORT_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+RECORD_SCHEMAS = {
+    "project": ImportedProject,
+    "column": ImportedColumn,
+    "task": ImportedTask,
+    "log": ImportedLog,
+}
+
+# порядок загрузки внутри пачки: родительские строки копируются раньше дочерних
+COPY_TABLES = {
+    "projects": ["id", "name", "description", "created_at", "last_updated_at"],
+    "project_users": ["id", "project_id", "user_id", "role"],
+    "columns": ["id", "project_id", "name", "description", "order", "created_at", "last_updated_at"],
+    "tasks": [
+        "id", "column_id", "title", "description", "status", "priority", "order", "created_at", "last_updated_at"
+    ],
+    "task_assignees": ["id", "task_id", "user_id", "assigned_at"],
+    "task_logs": ["id", "task_id", "message", "created_at"],
+}
+
+IMPORTED_COUNTERS = {"projects": "project", "columns": "column", "tasks": "task", "task_logs": "log"}
+
+
+def _timestamp(value: Optional[datetime], default: datetime) -> datetime:
+    # колонки timestamp without time zone: бинарный COPY принимает только naive datetime
+    if value is None:
+        return default
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class BoardImporter:
+    """Валидирует записи по одной и загружает их пачками через COPY в одной транзакции."""
+
+    def __init__(self, session: AsyncSession, owner_id: Optional[UUID] = None, enforce_access: bool = False):
+        self.session = session
+        self.owner_id = owner_id
+        self.enforce_access = enforce_access
+        self.buffers = {table: [] for table in COPY_TABLES}
+        self.buffered = 0
+        self.last_orders: dict[tuple[str, UUID], int] = {}
+        self.rows_read = 0
+        self.imported = {record_type: 0 for record_type in RECORD_SCHEMAS}
+        self.errors: list[ImportRowError] = []
+        self.error_count = 0
+        self.now = datetime.utcnow()
+        # родители, на которые ссылаются строки текущей пачки: проверяются перед ее COPY
+        self.referenced: dict[str, set[UUID]] = {"projects": set(), "columns": set(), "tasks": set()}
+        self.created_projects: set[UUID] = set()
+        # существующие проекты, в которые добавлены строки: получают resync после commit
+        self.affected_projects: set[UUID] = set()
+
+    def _error(self, line: int, error: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(line=line, error=error))
+
+    async def _next_order(self, model, scope_attr, scope_id: UUID, order: Optional[int]) -> int:
+        key = (model.__tablename__, scope_id)
+        if key not in self.last_orders:
+            result = await self.session.execute(select(func.max(model.order)).where(scope_attr == scope_id))
+            self.last_orders[key] = result.scalar() or 0
+        if order is None:
+            order = self.last_orders[key] + ORDER_GAP
+        self.last_orders[key] = max(self.last_orders[key], order)
+        return order
+
+    async def add(self, line: int, record: dict | str) -> None:
+        self.rows_read += 1
+        if isinstance(record, str):
+            # строку не удалось разобрать, парсер передал текст ошибки
+            self._error(line, record)
+            return
+        schema = RECORD_SCHEMAS.get(record.get("type"))
+        if schema is None:
+            self._error(line, f"Unknown record type: {record.get('type')!r}")
+            return
+        try:
+            item = schema.model_validate(record)
+        except ValidationError as e:
+            self._error(line, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            ))
+            return
+
+        item_id = item.id or uuid4()
+        created_at = _timestamp(item.created_at, self.now)
+        if isinstance(item, ImportedProject):
+            self._buffer("projects", (item_id, item.name, item.description or "", created_at, created_at))
+            if self.owner_id is not None:
+                # COPY не применяет python-default модели, а role в таблице NOT NULL
+                self._buffer("project_users", (uuid4(), item_id, self.owner_id, OWNER))
+        elif isinstance(item, ImportedColumn):
+            self.referenced["projects"].add(item.project_id)
+            order = await self._next_order(BColumn, BColumn.project_id, item.project_id, item.order)
+            self._buffer("columns", (
+                item_id, item.project_id, item.name, item.description or "", order, created_at, created_at
+            ))
+        elif isinstance(item, ImportedTask):
+            self.referenced["columns"].add(item.column_id)
+            order = await self._next_order(Task, Task.column_id, item.column_id, item.order)
+            self._buffer("tasks", (
+                item_id, item.column_id, item.title, item.description or "", item.status or "Active",
+                item.priority if item.priority is not None else 5, order, created_at, created_at
+            ))
+            for user_id in set(item.assignee_ids):
+                self._buffer("task_assignees", (uuid4(), item_id, user_id, created_at))
+        else:
+            self.referenced["tasks"].add(item.task_id)
+            self._buffer("task_logs", (item_id, item.task_id, item.message, created_at))
+
+        if self.buffered >= IMPORT_BATCH_SIZE:
+            await self.flush()
+
+    def _buffer(self, table: str, row: tuple) -> None:
+        self.buffers[table].append(row)
+        self.buffered += 1
+
+    async def flush(self) -> None:
+        if not self.buffered:
+            return
+        await self._check_batch()
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        for table, columns in COPY_TABLES.items():
+            rows = self.buffers[table]
+            if not rows:
+                continue
+            await driver_connection.copy_records_to_table(table, records=rows, columns=columns)
+            if table in IMPORTED_COUNTERS:
+                self.imported[IMPORTED_COUNTERS[table]] += len(rows)
+            self.buffers[table] = []
+        self.buffered = 0
+        self.referenced = {key: set() for key in self.referenced}
+
+    async def _batch_projects(self) -> set[UUID]:
+        # родители, созданные в этой же пачке, уже проверены через свой проект;
+        # строки прошлых пачек скопированы в транзакцию и видны запросам
+        new_columns = {row[0] for row in self.buffers["columns"]}
+        new_tasks = {row[0] for row in self.buffers["tasks"]}
+        project_ids = set(self.referenced["projects"])
+        column_ids = self.referenced["columns"] - new_columns
+        if column_ids:
+            project_ids.update((await get_column_project_ids(self.session, column_ids)).values())
+        task_ids = self.referenced["tasks"] - new_tasks
+        if task_ids:
+            project_ids.update((await get_task_project_ids(self.session, task_ids)).values())
+        return project_ids
+
+    async def _check_batch(self) -> None:
+        """До COPY пачки: строки в чужие проекты прерывают импорт, не дойдя до базы."""
+        self.created_projects.update(row[0] for row in self.buffers["projects"])
+        if not self.enforce_access and not settings.EVENTS_ENABLED:
+            return
+        project_ids = await self._batch_projects() - self.created_projects
+        if self.enforce_access and project_ids:
+            forbidden = project_ids - (await get_project_roles(self.session, self.owner_id)).keys()
+            if forbidden:
+                # доступ мог быть выдан на другом воркере: перед отказом карта перечитывается
+                forbidden -= (await get_project_roles(self.session, self.owner_id, fresh=True)).keys()
+            if forbidden:
+                raise PermissionError(
+                    f"Not enough permissions for projects: {', '.join(sorted(map(str, forbidden)))}"
+                )
+        self.affected_projects |= project_ids
+
+
+async def import_records(
+        session: AsyncSession,
+        records: AsyncIterator[tuple[int, dict | str]],
+        owner_id: Optional[UUID] = None,
+        enforce_access: bool = False
+) -> ImportReport:
+    """enforce_access: колонки, задачи и логи можно добавлять только в проекты, где состоит owner_id."""
+    started = time.perf_counter()
+    importer = BoardImporter(session, owner_id, enforce_access)
+    fatal_error = None
+    try:
+        async for line, record in records:
+            await importer.add(line, record)
+        await importer.flush()
+        # открытые доски затронутых проектов перечитываются одним resync
+        await publish_resync(session, importer.affected_projects)
+        await session.commit()
+    except (asyncpg.PostgresError, DBAPIError, PermissionError) as e:
+        # COPY атомарен: нарушение FK или уникальности откатывает весь импорт
+        await session.rollback()
+        fatal_error = str(e)
+    if owner_id is not None and importer.created_projects:
+        # владелец получил новые проекты
+        invalidate_project_roles(owner_id)
+
+    duration = time.perf_counter() - started
+    return ImportReport(
+        committed=fatal_error is None,
+        rows_read=importer.rows_read,
+        imported=importer.imported if fatal_error is None else {key: 0 for key in importer.imported},
+        error_count=importer.error_count,
+        errors=importer.errors,
+        fatal_error=fatal_error,
+        duration_seconds=round(duration, 3),
+        rows_per_second=round(importer.rows_read / duration, 1) if duration else 0.0
+    )
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    tail = b""
+    async for chunk in chunks:
+        tail += chunk
+        *lines, tail = tail.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8") + "\n"
+    if tail:
+        yield tail.decode("utf-8")
+
+
+async def parse_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict | str]]:
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, f"Invalid JSON: {e}"
+            continue
+        yield line_no, record if isinstance(record, dict) else "Record must be a JSON object"
+
+
+async def parse_csv(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict | str]]:
+    header = None
+    pending = ""
+    line_no = 0
+    start = 1
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            start = line_no
+        pending += line
+        # поле в кавычках может содержать перевод строки: копим строки, пока кавычки не закроются
+        if pending.count('"') % 2:
+            continue
+        row, pending = next(csv.reader([pending]), []), ""
+        if not row:
+            continue
+        if header is None:
+            header = row
+            continue
+        # пустые ячейки не передаются, чтобы сработали значения по умолчанию схем
+        yield start, {key: value for key, value in zip(header, row) if value != ""}
+    if pending:
+        yield start, "Unterminated quoted field"
+
+
+def parse_records(lines: AsyncIterator[str], format: str) -> AsyncIterator[tuple[int, dict | str]]:
+    return parse_csv(lines) if format == "csv" else parse_ndjson(lines)
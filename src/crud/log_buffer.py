@@ -0,0 +1,168 @@
+import asyncio
+import logging
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.settings import settings
+from src.core.database import AsyncSessionLocal
+from src.models.models import TaskLog
+
+# ключ session.info: логи текущей транзакции, уходящие в буфер только после commit
+PENDING_LOGS = "pending_task_logs"
+# сигнал остановки в очереди: flusher дописывает набранную пачку и завершается
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class TaskLogBuffer:
+    """Write-behind для логов задач: строки копятся в ограниченной очереди и пишутся пачками.
+
+    Место в очереди резервируется при добавлении лога, поэтому после commit строка
+    гарантированно помещается; если места нет, лог пишется в транзакции запроса.
+    """
+
+    def __init__(self, maxsize: int, batch_size: int, interval: float):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.interval = interval
+        self.flushed = 0
+        self.dropped = 0
+        self._queue: asyncio.Queue[dict | object] | None = None
+        self._reserved = 0
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._stopping
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    def try_reserve(self) -> bool:
+        if not self.running or self._queue.qsize() + self._reserved >= self.maxsize:
+            return False
+        self._reserved += 1
+        return True
+
+    def release(self, count: int) -> None:
+        self._reserved -= count
+
+    def put_reserved(self, rows: list[dict]) -> None:
+        self._reserved -= len(rows)
+        for row in rows:
+            self._queue.put_nowait(row)
+
+    async def _next_batch(self) -> tuple[list[dict], bool]:
+        """Пачка закрывается по размеру, по истечении interval с первой строки или по _STOP.
+
+        Возвращает строки и признак остановки; набранные до _STOP строки не теряются.
+        """
+        batch = []
+        item = await self._queue.get()
+        deadline = asyncio.get_running_loop().time() + self.interval
+        while item is not _STOP:
+            batch.append(item)
+            timeout = deadline - asyncio.get_running_loop().time()
+            if len(batch) >= self.batch_size or timeout <= 0:
+                return batch, False
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return batch, False
+        return batch, True
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if not batch:
+                continue
+            try:
+                await self.flush(batch)
+            except (OSError, DBAPIError) as e:
+                self.dropped += len(batch)
+                logger.error("Failed to write %d buffered task logs: %s", len(batch), e)
+
+    async def flush(self, rows: list[dict]) -> None:
+        async with AsyncSessionLocal() as session:
+            try:
+                await session.execute(insert(TaskLog), rows)
+                await session.commit()
+                self.flushed += len(rows)
+                return
+            except IntegrityError:
+                await session.rollback()
+
+            # задачу могли удалить до записи ее лога: такие строки пропускаются
+            for row in rows:
+                try:
+                    async with session.begin_nested():
+                        await session.execute(insert(TaskLog), [row])
+                    self.flushed += 1
+                except IntegrityError:
+                    self.dropped += 1
+            await session.commit()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        # без cancel(): пачка, уже снятая с очереди или записываемая сейчас, дописывается до конца
+        self._stopping = True
+        self._queue.put_nowait(_STOP)
+        await self._task
+        self._task = None
+
+        # строки транзакций, закоммиченных после _STOP
+        rows = []
+        while not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+        for start in range(0, len(rows), self.batch_size):
+            await self.flush(rows[start:start + self.batch_size])
+
+
+log_buffer = TaskLogBuffer(settings.LOG_BUFFER_SIZE, settings.LOG_FLUSH_BATCH_SIZE, settings.LOG_FLUSH_INTERVAL)
+
+
+def add_task_log(session: AsyncSession, task_id: UUID, message: str, created_at: datetime | None = None) -> None:
+    row = {"id": uuid4(), "task_id": task_id, "message": message, "created_at": created_at or datetime.utcnow()}
+    if log_buffer.try_reserve():
+        session.sync_session.info.setdefault(PENDING_LOGS, []).append(row)
+    else:
+        session.add(TaskLog(**row))
+
+
+def add_task_logs(session: AsyncSession, rows: list[dict]) -> list[dict]:
+    """Резервирует место под строки; возвращает те, что нужно вставить в текущей транзакции."""
+    rejected = []
+    for row in rows:
+        if log_buffer.try_reserve():
+            session.sync_session.info.setdefault(PENDING_LOGS, []).append(row)
+        else:
+            rejected.append(row)
+    return rejected
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed_logs(session: Session) -> None:
+    rows = session.info.pop(PENDING_LOGS, None)
+    if rows:
+        log_buffer.put_reserved(rows)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_rolled_back_logs(session: Session, transaction) -> None:
+    # после отката или закрытия без commit зарезервированные места освобождаются
+    if transaction.parent is None and not transaction.nested:
+        rows = session.info.pop(PENDING_LOGS, None)
+        if rows:
+            log_buffer.release(len(rows))
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.settings import settings
+from src.core.database import AsyncSessionLocal
+
+# task_logs и task_logs_archive секционированы по месяцам: секция {table}_pYYYYMM
+# хранит [первое число месяца, первое число следующего). Срок хранения применяется
+# к секциям целиком - DETACH/ATTACH/DROP вместо массового DELETE
+LOG_TABLE = "task_logs"
+ARCHIVE_TABLE = "task_logs_archive"
+DEFAULT_PARTITION = "task_logs_default"
+PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+# ключ advisory-блокировки: обслуживание секций выполняет только один воркер
+MAINTENANCE_LOCK_ID = 0x7461736b6c6f67
+# DDL над секциями ждет блокировку недолго, чтобы не выстраивать очередь за собой
+LOCK_TIMEOUT = "5s"
+
+logger = logging.getLogger(__name__)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+async def list_partitions(session: AsyncSession, table: str) -> dict[date, str]:
+    result = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table}
+    )
+    partitions = {}
+    for name in result.scalars():
+        match = PARTITION_SUFFIX.search(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+async def _lock(session: AsyncSession) -> bool:
+    await session.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    result = await session.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": MAINTENANCE_LOCK_ID})
+    return result.scalar()
+
+
+async def create_partition(session: AsyncSession, month: date) -> None:
+    name = partition_name(LOG_TABLE, month)
+    bounds = f"FROM ('{month}') TO ('{add_months(month, 1)}')"
+    # строки месяца, попавшие в DEFAULT до создания секции, переносятся в нее до ATTACH
+    await session.execute(text(f"CREATE TABLE {name} (LIKE {LOG_TABLE} INCLUDING DEFAULTS)"))
+    await session.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE created_at >= '{month}' AND created_at < '{add_months(month, 1)}' RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ))
+    await session.execute(text(f"ALTER TABLE {LOG_TABLE} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+
+
+async def expire_partition(session: AsyncSession, month: date, name: str, mode: str) -> None:
+    await session.execute(text(f"ALTER TABLE {LOG_TABLE} DETACH PARTITION {name}"))
+    if mode == "drop":
+        await session.execute(text(f"DROP TABLE {name}"))
+        return
+
+    archive_name = partition_name(ARCHIVE_TABLE, month)
+    if month in await list_partitions(session, ARCHIVE_TABLE):
+        # за этот месяц архив уже есть (перенос до секционирования): досыпаем строки
+        await session.execute(text(
+            f"INSERT INTO {ARCHIVE_TABLE} SELECT * FROM {name} ON CONFLICT DO NOTHING"
+        ))
+        await session.execute(text(f"DROP TABLE {name}"))
+        return
+
+    # архив компактный: без внешнего ключа на tasks и без btree по task_id
+    constraints = await session.execute(
+        text("SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"),
+        {"table": name}
+    )
+    for constraint in constraints.scalars().all():
+        await session.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"'))
+    indexes = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE i.indrelid = CAST(:table AS regclass) AND NOT i.indisprimary"
+        ),
+        {"table": name}
+    )
+    for index in indexes.scalars().all():
+        await session.execute(text(f'DROP INDEX "{index}"'))
+    await session.execute(text(f"ALTER TABLE {name} RENAME TO {archive_name}"))
+    await session.execute(text(
+        f"ALTER TABLE {ARCHIVE_TABLE} ATTACH PARTITION {archive_name} "
+        f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+    ))
+
+
+async def maintain_log_partitions(
+        retention_days: int | None = settings.LOG_RETENTION_DAYS,
+        months_ahead: int = settings.LOG_PARTITIONS_AHEAD,
+        mode: str = settings.LOG_EXPIRED_PARTITIONS
+) -> tuple[list[str], list[str]]:
+    today = datetime.utcnow().date()
+    current_month = today.replace(day=1)
+    async with AsyncSessionLocal() as session:
+        existing = await list_partitions(session, LOG_TABLE)
+
+    # каждая операция - отдельная короткая транзакция под advisory-блокировкой
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current_month, offset)
+        if month in existing:
+            continue
+        async with AsyncSessionLocal() as session:
+            if not await _lock(session):
+                break
+            # пока ждали блокировку, секцию мог создать другой воркер
+            if month not in await list_partitions(session, LOG_TABLE):
+                await create_partition(session, month)
+            await session.commit()
+        created.append(partition_name(LOG_TABLE, month))
+
+    expired = []
+    if retention_days is not None:
+        cutoff = today - timedelta(days=retention_days)
+        for month, name in sorted(existing.items()):
+            # секция истекает, только когда весь ее месяц старше срока хранения
+            if add_months(month, 1) > cutoff:
+                break
+            async with AsyncSessionLocal() as session:
+                if not await _lock(session):
+                    break
+                await expire_partition(session, month, name, mode)
+                await session.commit()
+            expired.append(name)
+    return created, expired
+
+
+async def log_maintenance_worker() -> None:
+    while True:
+        try:
+            created, expired = await maintain_log_partitions()
+            if created or expired:
+                logger.info("Task log partitions created: %s, expired: %s", created, expired)
+        except (OSError, DBAPIError) as e:
+            logger.warning("Task log partition maintenance failed: %s", e)
+        except Exception:
+            # без обслуживания секции на следующий месяц не создаются: цикл не должен завершаться;
+            # CancelledError сюда не попадает
+            logger.exception("Task log partition maintenance crashed")
+        await asyncio.sleep(settings.LOG_ARCHIVE_INTERVAL)
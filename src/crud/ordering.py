@@ -0,0 +1,96 @@
+from uuid import UUID
+from typing import Optional
+from sqlalchemy import select, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# порядок хранится целыми числами с шагом ORDER_GAP: перемещение пишет одну строку,
+# пока между соседями есть место, иначе область (проект/колонка) перенумеровывается
+ORDER_GAP = 1024
+APPEND_ATTEMPTS = 3
+ORDER_CONSTRAINTS = ("uq_columns_project_id_order", "uq_tasks_column_id_order")
+
+
+class MissingReference(LookupError):
+    """Тело запроса ссылается на несуществующий проект, колонку или соседний элемент."""
+
+
+def is_order_conflict(error: IntegrityError) -> bool:
+    # SQLAlchemy оборачивает исключение asyncpg, в нем есть имя нарушенного ограничения;
+    # прочие IntegrityError (например, FK на несуществующую колонку) - не гонка за order
+    return getattr(error.orig.__cause__, "constraint_name", None) in ORDER_CONSTRAINTS
+
+
+def is_missing_reference(error: IntegrityError) -> bool:
+    # 23503 foreign_key_violation: ссылка на удаленную или несуществующую строку
+    return getattr(error.orig.__cause__, "sqlstate", None) == "23503"
+
+
+async def append_order(session: AsyncSession, model, scope_attr, scope_id: UUID) -> int:
+    result = await session.execute(select(func.max(model.order)).where(scope_attr == scope_id))
+    return (result.scalar() or 0) + ORDER_GAP
+
+
+async def add_with_order(session: AsyncSession, obj, scope_attr, scope_id: UUID) -> None:
+    # параллельная вставка в конец может получить тот же order: повторяем в savepoint
+    for attempt in range(APPEND_ATTEMPTS):
+        obj.order = await append_order(session, type(obj), scope_attr, scope_id)
+        try:
+            async with session.begin_nested():
+                session.add(obj)
+            return
+        except IntegrityError as e:
+            if not is_order_conflict(e) or attempt == APPEND_ATTEMPTS - 1:
+                raise
+
+
+async def rebalance(session: AsyncSession, model, scope_attr, scope_id: UUID) -> None:
+    ranked = (
+        select(model.id, func.row_number().over(order_by=(model.order, model.id)).label("position"))
+        .where(scope_attr == scope_id)
+        .subquery()
+    )
+    await session.execute(
+        update(model)
+        .where(model.id == ranked.c.id)
+        .values(order=ranked.c.position * ORDER_GAP)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def order_after(
+        session: AsyncSession,
+        model,
+        scope_attr,
+        scope_id: UUID,
+        after_id: Optional[UUID],
+        moving_id: UUID
+) -> int:
+    if after_id == moving_id:
+        raise ValueError("Item cannot be placed after itself")
+
+    for _ in range(2):
+        after_order = None
+        if after_id is not None:
+            result = await session.execute(
+                select(model.order).where(model.id == after_id, scope_attr == scope_id)
+            )
+            after_order = result.scalar_one_or_none()
+            if after_order is None:
+                raise MissingReference("Item to place after was not found in the target scope")
+
+        query = select(func.min(model.order)).where(scope_attr == scope_id, model.id != moving_id)
+        if after_order is not None:
+            query = query.where(model.order > after_order)
+        next_order = (await session.execute(query)).scalar()
+
+        if after_order is None:
+            return ORDER_GAP if next_order is None else next_order - ORDER_GAP
+        if next_order is None:
+            return after_order + ORDER_GAP
+        if next_order - after_order > 1:
+            return (after_order + next_order) // 2
+
+        await rebalance(session, model, scope_attr, scope_id)
+
+    raise ValueError("Could not find a free position after rebalancing")
@@ -1,10 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert, delete
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
 from src.models.models import Project, ProjectUser, User
 from src.schemas.project import ProjectCreate, ProjectUpdate
 from uuid import UUID, uuid4
 from datetime import datetime
 
+from src.core.pagination import paginate, DEFAULT_PAGE_SIZE
+from src.crud.access import MEMBER, invalidate_project_roles
+
 
 async def create_project(session: AsyncSession, project_data: ProjectCreate) -> Project:
     new_project = Project(
@@ -25,9 +29,20 @@ async def get_project_by_id(session: AsyncSession, project_id: str) -> Project |
     return result.scalar_one_or_none()
 
 
-async def get_all_projects(session: AsyncSession) -> list[Project]:
-    result = await session.execute(select(Project))
-    return result.scalars().all()
+async def get_all_projects(
+        session: AsyncSession,
+        user_id: UUID,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+) -> tuple[list[Project], str | None]:
+    # видны только проекты, в которых пользователь состоит
+    return await paginate(
+        session,
+        select(Project).join(ProjectUser).where(ProjectUser.user_id == user_id),
+        [(Project.created_at, False), (Project.id, False)],
+        limit,
+        cursor
+    )
 
 
 async def update_project(session: AsyncSession, project_id: UUID, project_data: ProjectUpdate) -> Project | None:
@@ -56,27 +71,36 @@ async def delete_project(session: AsyncSession, project_id: UUID) -> bool:
     return True
 
 
-async def add_user_to_project(session: AsyncSession, project_id: UUID, user_id: UUID) -> None:
+async def add_user_to_project(session: AsyncSession, project_id: UUID, user_id: UUID, role: str = MEMBER) -> None:
     await session.execute(
-        insert(ProjectUser).values(project_id=project_id, user_id=user_id)
+        insert(ProjectUser)
+        .values(project_id=project_id, user_id=user_id, role=role)
+        .on_conflict_do_nothing(index_elements=[ProjectUser.project_id, ProjectUser.user_id])
     )
     await session.commit()
+    invalidate_project_roles(user_id)
 
 
 async def remove_user_from_project(session: AsyncSession, project_id: UUID, user_id: UUID) -> None:
     await session.execute(
         delete(ProjectUser).where(
-            ProjectUser.c.project_id == project_id,
-            ProjectUser.c.user_id == user_id
+            ProjectUser.project_id == project_id,
+            ProjectUser.user_id == user_id
         )
     )
     await session.commit()
+    invalidate_project_roles(user_id)
 
 
-async def get_project_users(session: AsyncSession, project_id: UUID) -> list[User]:
-    result = await session.execute(
+async def get_project_users(
+        session: AsyncSession,
+        project_id: UUID,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+) -> tuple[list[User], str | None]:
+    query = (
         select(User)
         .join(ProjectUser)
-        .where(ProjectUser.c.project_id == project_id)
+        .where(ProjectUser.project_id == project_id)
     )
-    return result.scalars().all()
\ No newline at end of file
+    return await paginate(session, query, [(User.username, False), (User.id, False)], limit, cursor)
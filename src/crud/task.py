@@ -1,64 +1,178 @@
 from uuid import uuid4, UUID
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, noload
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, delete, and_, or_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from src.models.models import Task, TaskLog, TaskAssignee, User
-from src.schemas.task import TaskCreate, TaskUpdate
+from sqlalchemy.exc import IntegrityError
+
+from src.models.models import Task, TaskLog, TaskAssignee, User, BColumn
+from src.schemas.task import TaskCreate, TaskUpdate, TaskMove, TaskSummaryOut
+from src.schemas.task_log import TaskLogOut
+from src.schemas.user import UserOut
+from src.core.pagination import paginate, DEFAULT_PAGE_SIZE
+from src.core.serialization import row_columns
+from src.core.includes import TASK_INCLUDES
+from src.crud.ordering import add_with_order, append_order, order_after, is_order_conflict, is_missing_reference, MissingReference
+from src.crud.events import publish_task_event
+from src.crud.log_buffer import add_task_log
 
 from typing import Optional
-from sqlalchemy import func, asc, desc
+from sqlalchemy import func
+
+
+def not_null_update(update_data: dict) -> dict:
+    # колонки NOT NULL: явный null в description очищает описание, в остальных полях - не меняет их
+    if "description" in update_data and update_data["description"] is None:
+        update_data["description"] = ""
+    return {key: value for key, value in update_data.items() if value is not None}
+
+
+def like_pattern(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # created_at/last_updated_at хранятся без часового пояса в UTC
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def task_load_options(include: frozenset[str] = frozenset()) -> list:
+    # не запрошенные связи не загружаются вовсе (noload отдает пустой список)
+    return [
+        selectinload(Task.assignees) if "users" in include else noload(Task.assignees),
+        selectinload(Task.logs) if "logs" in include else noload(Task.logs)
+    ]
+
 
+async def attach_log_stats(session: AsyncSession, tasks: list[Task], include: frozenset[str] = frozenset()) -> list[Task]:
+    if not tasks:
+        return tasks
 
-async def create_task(session: AsyncSession, task_data: TaskCreate) -> Task:
+    if "logs" in include:
+        for task in tasks:
+            task.log_count = len(task.logs)
+            task.latest_log = max(task.logs, key=lambda log: log.created_at, default=None)
+        return tasks
+
+    log_count = func.count().over(partition_by=TaskLog.task_id).label("log_count")
+    result = await session.execute(
+        select(TaskLog, log_count)
+        .where(TaskLog.task_id.in_([task.id for task in tasks]))
+        .distinct(TaskLog.task_id)
+        .order_by(TaskLog.task_id, TaskLog.created_at.desc())
+    )
+    stats = {log.task_id: (log, count) for log, count in result.all()}
+    for task in tasks:
+        task.latest_log, task.log_count = stats.get(task.id, (None, 0))
+    return tasks
+
+
+async def create_task(
+        session: AsyncSession,
+        task_data: TaskCreate,
+        include: frozenset[str] = frozenset()
+) -> Task:
     new_task = Task(
         id=uuid4(),
         title=task_data.title,
-        description=task_data.description,
+        # колонки NOT NULL: явный null заменяется значениями по умолчанию, как при импорте
+        description=task_data.description or "",
         column_id=task_data.column_id,
-        status=task_data.status,
-        priority=task_data.priority,
+        status=task_data.status or "Active",
+        priority=task_data.priority if task_data.priority is not None else 5,
         created_at=datetime.utcnow(),
         last_updated_at=datetime.utcnow()
     )
-    session.add(new_task)
-    await session.flush()
-
-    log = TaskLog(
-        id=uuid4(),
-        task_id=new_task.id,
-        created_at=datetime.utcnow(),
-        message=f"Task '{new_task.title}' was created."
-    )
-    session.add(log)
+    try:
+        await add_with_order(session, new_task, Task.column_id, task_data.column_id)
+        await publish_task_event(session, "task.created", new_task.id, new_task.column_id, order=new_task.order)
+    except IntegrityError as e:
+        await session.rollback()
+        if is_order_conflict(e):
+            raise ValueError("Task order is already taken in this column")
+        if is_missing_reference(e):
+            raise MissingReference("Column does not exist")
+        raise
+
+    add_task_log(session, new_task.id, f"Task '{new_task.title}' was created.")
 
     await session.commit()
-    result = await session.execute(
-        select(Task)
-        .where(Task.id == new_task.id)
-        .options(
-            selectinload(Task.users),
-            selectinload(Task.logs),
-            selectinload(Task.column)
-        )
-    )
-    return result.scalar_one()
+    return await get_task_by_id(session, new_task.id, include)
 
 
-async def get_task_by_id(session: AsyncSession, task_id: UUID) -> Task | None:
+async def get_task_by_id(
+        session: AsyncSession,
+        task_id: UUID,
+        include: frozenset[str] = frozenset(),
+        with_stats: bool = True
+) -> Task | None:
     result = await session.execute(
         select(Task)
         .where(Task.id == task_id)
-        .options(
-            selectinload(Task.users),
-            selectinload(Task.logs),
-            selectinload(Task.column)
+        .options(*task_load_options(include))
+        .execution_options(populate_existing=True)
+    )
+    task = result.scalar_one_or_none()
+    if task is not None and with_stats:
+        await attach_log_stats(session, [task], include)
+    return task
+
+
+# поля TaskSummaryOut, которые собираются отдельными запросами, а не из строки tasks
+TASK_ROW_EXCLUDE = ("log_count", "latest_log", "users", "logs")
+
+
+async def attach_row_relations(session: AsyncSession, tasks: list[dict], include: frozenset[str] = frozenset()) -> list[dict]:
+    # то же, что attach_log_stats, но для строк-словарей: связи догружаются плоскими выборками
+    if not tasks:
+        return tasks
+    by_id = {task["id"]: task for task in tasks}
+    for task in tasks:
+        task.update(log_count=0, latest_log=None, users=[], logs=[])
+
+    if "users" in include:
+        result = await session.execute(
+            select(TaskAssignee.task_id.label("assignee_task_id"), *row_columns(User, UserOut))
+            .join(User, User.id == TaskAssignee.user_id)
+            .where(TaskAssignee.task_id.in_(by_id))
+            .order_by(User.username)
+        )
+        for row in result.mappings():
+            user = dict(row)
+            by_id[user.pop("assignee_task_id")]["users"].append(user)
+
+    if "logs" in include:
+        result = await session.execute(
+            select(*row_columns(TaskLog, TaskLogOut))
+            .where(TaskLog.task_id.in_(by_id))
+            .order_by(TaskLog.created_at)
         )
+        for row in result.mappings():
+            by_id[row["task_id"]]["logs"].append(dict(row))
+        for task in tasks:
+            task["log_count"] = len(task["logs"])
+            task["latest_log"] = task["logs"][-1] if task["logs"] else None
+        return tasks
+
+    log_count = func.count().over(partition_by=TaskLog.task_id).label("log_count")
+    result = await session.execute(
+        select(*row_columns(TaskLog, TaskLogOut), log_count)
+        .where(TaskLog.task_id.in_(by_id))
+        .distinct(TaskLog.task_id)
+        .order_by(TaskLog.task_id, TaskLog.created_at.desc())
     )
-    return result.scalar_one_or_none()
+    for row in result.mappings():
+        log = dict(row)
+        task = by_id[log["task_id"]]
+        task["log_count"] = log.pop("log_count")
+        task["latest_log"] = log
+    return tasks
 
 
 async def get_tasks_by_column(
@@ -68,110 +182,215 @@ async def get_tasks_by_column(
         user_id: Optional[UUID] = None,
         sort_by_create_time: Optional[str] = None,
         sort_by_update_time: Optional[str] = None,
-        sort_by_priority: Optional[str] = None
-) -> list[Task]:
+        sort_by_priority: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include: frozenset[str] = frozenset()
+) -> tuple[list[dict], str | None]:
+    # горячий список: строки без ORM-объектов в форме TaskSummaryOut
     query = (
-        select(Task)
+        select(*row_columns(Task, TaskSummaryOut, exclude=TASK_ROW_EXCLUDE))
         .where(Task.column_id == column_id)
-        .options(
-            selectinload(Task.users),
-            selectinload(Task.logs),
-            selectinload(Task.column)
-        )
     )
 
     if name_contains:
-        query = query.where(func.lower(Task.title).contains(name_contains.lower()))
+        # ILIKE по title обслуживается trigram-индексом ix_tasks_title_trgm
+        query = query.where(Task.title.ilike(like_pattern(name_contains), escape="\\"))
 
     if user_id:
-        query = query.join(TaskAssignee).where(TaskAssignee.c.user_id == user_id)
+        query = query.join(TaskAssignee).where(TaskAssignee.user_id == user_id)
 
+    order = []
     if sort_by_create_time:
-        if sort_by_create_time.lower() == 'desc':
-            query = query.order_by(desc(Task.created_at))
-        else:
-            query = query.order_by(asc(Task.created_at))
+        order.append((Task.created_at, sort_by_create_time.lower() == 'desc'))
 
     if sort_by_update_time:
-        if sort_by_update_time.lower() == 'desc':
-            query = query.order_by(desc(Task.last_updated_at))
-        else:
-            query = query.order_by(asc(Task.last_updated_at))
+        order.append((Task.last_updated_at, sort_by_update_time.lower() == 'desc'))
 
     if sort_by_priority:
-        if sort_by_update_time.lower() == 'desc':
-            query = query.order_by(desc(Task.priority))
-        else:
-            query = query.order_by(asc(Task.priority))
+        order.append((Task.priority, sort_by_priority.lower() == 'desc'))
+
+    if not order:
+        order.append((Task.order, False))
+    order.append((Task.id, order[-1][1]))
 
-    result = await session.execute(query)
-    return result.scalars().all()
+    tasks, next_cursor = await paginate(session, query, order, limit, cursor, mappings=True)
+    await attach_row_relations(session, tasks, include)
+    return tasks, next_cursor
 
 
-async def update_task(session: AsyncSession, task_id: UUID, task_data: TaskUpdate) -> Task | None:
-    task = await get_task_by_id(session, task_id)
+async def search_project_tasks(
+        session: AsyncSession,
+        project_id: UUID,
+        q: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        include: frozenset[str] = frozenset()
+) -> list[Task]:
+    pattern = like_pattern(q)
+    # %> (word similarity) и ILIKE используют GIN trigram-индексы, совпадения в title весят больше
+    rank = func.greatest(
+        func.word_similarity(q, Task.title),
+        func.word_similarity(q, func.coalesce(Task.description, "")) * 0.5
+    )
+    result = await session.execute(
+        select(Task)
+        .join(BColumn, BColumn.id == Task.column_id)
+        .where(BColumn.project_id == project_id)
+        .where(
+            or_(
+                Task.title.op("%>")(q),
+                Task.title.ilike(pattern, escape="\\"),
+                Task.description.ilike(pattern, escape="\\")
+            )
+        )
+        .options(*task_load_options(include))
+        .order_by(rank.desc(), Task.id)
+        .limit(limit)
+    )
+    tasks = list(result.scalars().all())
+    await attach_log_stats(session, tasks, include)
+    return tasks
+
+
+async def update_task(
+        session: AsyncSession,
+        task_id: UUID,
+        task_data: TaskUpdate,
+        include: frozenset[str] = frozenset()
+) -> Task | None:
+    task = await get_task_by_id(session, task_id, with_stats=False)
     if not task:
         return None
 
-    for key, value in task_data.model_dump(exclude_unset=True).items():
+    previous_column_id = task.column_id
+    update_data = not_null_update(task_data.model_dump(exclude_unset=True))
+    if update_data.get("column_id") not in (None, task.column_id):
+        # при переносе в другую колонку задача встает в ее конец
+        task.order = await append_order(session, Task, Task.column_id, update_data["column_id"])
+
+    for key, value in update_data.items():
         setattr(task, key, value)
 
     task.last_updated_at = datetime.utcnow()
 
-    log = TaskLog(
-        id=uuid4(),
-        task_id=task.id,
-        created_at=datetime.utcnow(),
-        message=f"Task '{task.title}' was updated."
-    )
-    session.add(log)
+    add_task_log(session, task.id, f"Task '{task.title}' was updated.")
 
     task.last_updated_at = datetime.utcnow()
-    await session.commit()
-    await session.refresh(task)
-    return task
+    try:
+        if task.column_id != previous_column_id:
+            await publish_task_event(
+                session, "task.moved", task.id, task.column_id, order=task.order, from_column_id=previous_column_id
+            )
+        else:
+            await publish_task_event(session, "task.updated", task.id, task.column_id)
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if is_order_conflict(e):
+            raise ValueError("Task order changed concurrently, retry the request")
+        if is_missing_reference(e):
+            raise MissingReference("Target column does not exist")
+        raise
+    return await get_task_by_id(session, task_id, include)
+
+
+async def move_task(
+        session: AsyncSession,
+        task_id: UUID,
+        move: TaskMove,
+        include: frozenset[str] = frozenset()
+) -> Task | None:
+    task = await get_task_by_id(session, task_id, with_stats=False)
+    if not task:
+        return None
+
+    previous_column_id = task.column_id
+    target_column_id = move.column_id or task.column_id
+    task.order = await order_after(session, Task, Task.column_id, target_column_id, move.after_id, task.id)
+    task.last_updated_at = datetime.utcnow()
+
+    # перестановка внутри колонки пишет одну строку, в лог попадает только смена колонки
+    if target_column_id != task.column_id:
+        task.column_id = target_column_id
+        add_task_log(session, task.id, f"Task '{task.title}' was moved to another column.")
+
+    try:
+        await publish_task_event(
+            session, "task.moved", task.id, task.column_id, order=task.order, from_column_id=previous_column_id
+        )
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if is_order_conflict(e):
+            raise ValueError("Task order changed concurrently, retry the request")
+        if is_missing_reference(e):
+            raise MissingReference("Target column does not exist")
+        raise
+    return await get_task_by_id(session, task_id, include)
 
 
 async def delete_task(session: AsyncSession, task_id: UUID) -> bool:
-    task = await get_task_by_id(session, task_id)
+    # каскадное удаление ORM требует загруженных логов и исполнителей
+    task = await get_task_by_id(session, task_id, TASK_INCLUDES, with_stats=False)
     if not task:
         return False
 
     await session.delete(task)
+    await publish_task_event(session, "task.deleted", task.id, task.column_id)
     await session.commit()
     return True
 
 
 async def add_user_to_task(session: AsyncSession, task_id: UUID, user_id: UUID) -> None:
     await session.execute(
-        TaskAssignee.insert().values(task_id=task_id, user_id=user_id)
+        insert(TaskAssignee)
+        .values(task_id=task_id, user_id=user_id)
+        .on_conflict_do_nothing(index_elements=[TaskAssignee.task_id, TaskAssignee.user_id])
     )
+    await publish_task_event(session, "task.updated", task_id)
     await session.commit()
 
 
 async def remove_user_from_task(session: AsyncSession, task_id: UUID, user_id: UUID) -> None:
     await session.execute(
-        TaskAssignee.delete().where(
+        delete(TaskAssignee).where(
             and_(
-                TaskAssignee.c.task_id == task_id,
-                TaskAssignee.c.user_id == user_id
+                TaskAssignee.task_id == task_id,
+                TaskAssignee.user_id == user_id
             )
         )
     )
+    await publish_task_event(session, "task.updated", task_id)
     await session.commit()
 
 
-async def get_task_logs(session: AsyncSession, task_id: UUID) -> list[TaskLog]:
-    result = await session.execute(
-        select(TaskLog).where(TaskLog.task_id == task_id)
-    )
-    return result.scalars().all()
-
-
-async def get_users_by_task(session: AsyncSession, task_id: UUID) -> list[User]:
-    result = await session.execute(
+async def get_task_logs(
+        session: AsyncSession,
+        task_id: UUID,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+) -> tuple[list[TaskLog], str | None]:
+    # новые записи первыми: обратный проход по ix_task_logs_task_id_created_at
+    query = select(TaskLog).where(TaskLog.task_id == task_id)
+    if since is not None:
+        query = query.where(TaskLog.created_at >= naive_utc(since))
+    if until is not None:
+        query = query.where(TaskLog.created_at < naive_utc(until))
+    return await paginate(session, query, [(TaskLog.created_at, True), (TaskLog.id, True)], limit, cursor)
+
+
+async def get_users_by_task(
+        session: AsyncSession,
+        task_id: UUID,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+) -> tuple[list[User], str | None]:
+    query = (
         select(User)
         .join(TaskAssignee)
-        .where(TaskAssignee.c.task_id == task_id)
+        .where(TaskAssignee.task_id == task_id)
     )
-    return result.scalars().all()
+    return await paginate(session, query, [(User.username, False), (User.id, False)], limit, cursor)
+
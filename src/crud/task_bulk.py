@@ -0,0 +1,203 @@
+from typing import Iterable
+from uuid import uuid4, UUID
+from datetime import datetime
+
+from sqlalchemy import select, update, delete, func, case, cast, values, column, tuple_, String, Integer, BigInteger
+from sqlalchemy.dialects.postgresql import insert, UUID as PG_UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.settings import settings
+from src.models.models import Task, TaskLog, TaskAssignee
+from src.schemas.task import TaskCreate, TaskBulkUpdateItem, TaskAssignment
+from src.crud.ordering import ORDER_GAP, is_order_conflict, is_missing_reference
+from src.crud.log_buffer import add_task_logs
+from src.crud.access import get_column_project_ids, get_task_project_ids
+from src.crud.events import publish_resync
+
+# каждая пакетная операция - одна транзакция с многострочными INSERT/UPDATE/DELETE
+BATCH_CONFLICT = "Batch references a missing column, task or user, or conflicts with a concurrent change"
+
+
+def _is_batch_conflict(error: IntegrityError) -> bool:
+    # 409 только для FK и гонки за order; прочие нарушения ограничений - ошибка сервера
+    return is_missing_reference(error) or is_order_conflict(error)
+
+
+async def _last_orders(session: AsyncSession, column_ids: set[UUID]) -> dict[UUID, int]:
+    if not column_ids:
+        return {}
+    result = await session.execute(
+        select(Task.column_id, func.max(Task.order))
+        .where(Task.column_id.in_(column_ids))
+        .group_by(Task.column_id)
+    )
+    return {column_id: max_order for column_id, max_order in result.all()}
+
+
+async def _column_projects(session: AsyncSession, column_ids: Iterable[UUID]) -> set[UUID]:
+    column_ids = set(column_ids)
+    if not settings.EVENTS_ENABLED or not column_ids:
+        return set()
+    return set((await get_column_project_ids(session, column_ids)).values())
+
+
+async def _task_projects(session: AsyncSession, task_ids: Iterable[UUID]) -> set[UUID]:
+    task_ids = set(task_ids)
+    if not settings.EVENTS_ENABLED or not task_ids:
+        return set()
+    return set((await get_task_project_ids(session, task_ids)).values())
+
+
+async def _insert_logs(session: AsyncSession, rows: list[tuple[UUID, str]], action: str, now: datetime) -> None:
+    logs = add_task_logs(session, [
+        {"id": uuid4(), "task_id": task_id, "created_at": now, "message": f"Task '{title}' was {action}."}
+        for task_id, title in rows
+    ])
+    if logs:
+        await session.execute(insert(TaskLog), logs)
+
+
+async def bulk_create_tasks(session: AsyncSession, tasks: list[TaskCreate]) -> list[UUID]:
+    now = datetime.utcnow()
+    last_orders = await _last_orders(session, {task.column_id for task in tasks})
+
+    rows = []
+    for task in tasks:
+        order = (last_orders.get(task.column_id) or 0) + ORDER_GAP
+        last_orders[task.column_id] = order
+        rows.append({
+            "id": uuid4(),
+            "column_id": task.column_id,
+            "title": task.title,
+            # колонки NOT NULL: значения по умолчанию, как в create_task
+            "description": task.description or "",
+            "status": task.status or "Active",
+            "priority": task.priority if task.priority is not None else 5,
+            "order": order,
+            "created_at": now,
+            "last_updated_at": now
+        })
+
+    # id генерируются на клиенте, поэтому RETURNING не нужен; список параметров
+    # отправляется пачками многострочных VALUES (insertmanyvalues)
+    try:
+        await session.execute(insert(Task), rows)
+        await _insert_logs(session, [(row["id"], row["title"]) for row in rows], "created", now)
+        await publish_resync(session, await _column_projects(session, {task.column_id for task in tasks}))
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if _is_batch_conflict(e):
+            raise ValueError(BATCH_CONFLICT)
+        raise
+    return [row["id"] for row in rows]
+
+
+async def bulk_update_tasks(session: AsyncSession, items: list[TaskBulkUpdateItem]) -> list[UUID]:
+    now = datetime.utcnow()
+    last_orders = await _last_orders(session, {item.column_id for item in items if item.column_id})
+
+    data = []
+    for item in items:
+        order = None
+        if item.column_id is not None:
+            order = (last_orders.get(item.column_id) or 0) + ORDER_GAP
+            last_orders[item.column_id] = order
+        data.append((item.id, item.status, item.priority, item.column_id, order))
+
+    changes = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("status", String),
+        column("priority", Integer),
+        column("column_id", PG_UUID(as_uuid=True)),
+        column("order", BigInteger),
+        name="changes"
+    ).data(data)
+    # None рендерится нетипизированным NULL: если колонка VALUES целиком пустая, Postgres выведет text
+    status = cast(changes.c.status, String)
+    priority = cast(changes.c.priority, Integer)
+    column_id = cast(changes.c.column_id, PG_UUID(as_uuid=True))
+    new_order = cast(changes.c.order, BigInteger)
+
+    moved = column_id.is_not(None) & (column_id != Task.column_id)
+    # проекты до переноса: их доски тоже меняются
+    project_ids = await _task_projects(session, {item.id for item in items})
+    try:
+        result = await session.execute(
+            update(Task)
+            .where(Task.id == changes.c.id)
+            .values(
+                status=func.coalesce(status, Task.status),
+                priority=func.coalesce(priority, Task.priority),
+                # перенесенная задача встает в конец новой колонки
+                order=case((moved, new_order), else_=Task.order),
+                column_id=func.coalesce(column_id, Task.column_id),
+                last_updated_at=now
+            )
+            .returning(Task.id, Task.title)
+            .execution_options(synchronize_session=False)
+        )
+        updated = result.all()
+        await _insert_logs(session, updated, "updated", now)
+        project_ids |= await _column_projects(session, {item.column_id for item in items if item.column_id})
+        await publish_resync(session, project_ids)
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if _is_batch_conflict(e):
+            raise ValueError(BATCH_CONFLICT)
+        raise
+    return [task_id for task_id, _ in updated]
+
+
+async def bulk_delete_tasks(session: AsyncSession, ids: list[UUID]) -> list[UUID]:
+    ids = list(set(ids))
+    project_ids = await _task_projects(session, ids)
+    await session.execute(
+        delete(TaskLog).where(TaskLog.task_id.in_(ids)).execution_options(synchronize_session=False)
+    )
+    await session.execute(
+        delete(TaskAssignee).where(TaskAssignee.task_id.in_(ids)).execution_options(synchronize_session=False)
+    )
+    result = await session.execute(
+        delete(Task).where(Task.id.in_(ids)).returning(Task.id).execution_options(synchronize_session=False)
+    )
+    deleted = list(result.scalars().all())
+    await publish_resync(session, project_ids)
+    await session.commit()
+    return deleted
+
+
+async def bulk_assign_users(session: AsyncSession, assignments: list[TaskAssignment]) -> list[UUID]:
+    pairs = {(assignment.task_id, assignment.user_id) for assignment in assignments}
+    try:
+        result = await session.execute(
+            insert(TaskAssignee)
+            .values([{"id": uuid4(), "task_id": task_id, "user_id": user_id} for task_id, user_id in pairs])
+            .on_conflict_do_nothing(index_elements=[TaskAssignee.task_id, TaskAssignee.user_id])
+            .returning(TaskAssignee.task_id)
+        )
+        assigned = list(result.scalars().all())
+        await publish_resync(session, await _task_projects(session, assigned))
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if _is_batch_conflict(e):
+            raise ValueError(BATCH_CONFLICT)
+        raise
+    return assigned
+
+
+async def bulk_unassign_users(session: AsyncSession, assignments: list[TaskAssignment]) -> list[UUID]:
+    pairs = {(assignment.task_id, assignment.user_id) for assignment in assignments}
+    result = await session.execute(
+        delete(TaskAssignee)
+        .where(tuple_(TaskAssignee.task_id, TaskAssignee.user_id).in_(list(pairs)))
+        .returning(TaskAssignee.task_id)
+        .execution_options(synchronize_session=False)
+    )
+    unassigned = list(result.scalars().all())
+    await publish_resync(session, await _task_projects(session, unassigned))
+    await session.commit()
+    return unassigned
@@ -2,13 +2,18 @@ from uuid import UUID, uuid4
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from passlib.context import CryptContext
 from datetime import datetime
 
 from src.models.models import User
-from src.schemas.user import UserCreate, UserUpdate
+from src.core.pagination import paginate, DEFAULT_PAGE_SIZE
+from src.schemas.user import UserCreate, UserUpdate, UserOut
+from src.core.serialization import row_columns
+from src.core.cache import TTLCache
+from src.core.hashing import hash_password
+from src.settings import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# кэш аутентифицированных пользователей по id, используется в src.security
+principal_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL, name="principals")
 
 async def get_user_by_id(user_id: UUID, session: AsyncSession) -> User | None:
     result = await session.execute(select(User).where(User.id == user_id))
@@ -21,7 +26,7 @@ async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
 
 
 async def create_user(session: AsyncSession, user_data: UserCreate) -> User:
-    hashed_password = pwd_context.hash(user_data.password)
+    hashed_password = await hash_password(user_data.password)
 
     new_user = User(
         id=uuid4(),
@@ -54,13 +59,14 @@ async def update_user(
     update_data = user_data.model_dump(exclude_unset=True)
 
     if "password" in update_data:
-        update_data["password"] = pwd_context.hash(update_data["password"])
+        update_data["password"] = await hash_password(update_data["password"])
 
     for key, value in update_data.items():
         setattr(user, key, value)
 
     user.last_updated_at = datetime.utcnow()
     await session.commit()
+    principal_cache.invalidate(user_id)
     await session.refresh(user)
     return user
 
@@ -72,9 +78,21 @@ async def delete_user(user_id: UUID, session: AsyncSession) -> bool:
 
     await session.delete(user)
     await session.commit()
+    principal_cache.invalidate(user_id)
     return True
 
 
-async def get_all_users(session: AsyncSession) -> list[User]:
-    result = await session.execute(select(User))
-    return result.scalars().all()
+async def get_all_users(
+    session: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None
+) -> tuple[list[dict], str | None]:
+    return await paginate(
+        session,
+        select(*row_columns(User, UserOut)),
+        [(User.created_at, False), (User.id, False)],
+        limit,
+        cursor,
+        mappings=True
+    )
+
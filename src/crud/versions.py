@@ -0,0 +1,91 @@
+from uuid import UUID
+
+from sqlalchemy import select, func, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Project, BColumn, Task, TaskAssignee, TaskLog, User
+
+# версия ресурса - max(метка времени) и count(*) по каждой таблице, из которой собирается ответ:
+# count ловит удаления, которые не сдвигают максимум. Считается одним запросом без загрузки связей
+
+
+def _stats(name: str, timestamp, condition, *joins):
+    query = select(func.max(timestamp).label("changed_at"), func.count().label("total"))
+    for target, onclause in joins:
+        query = query.join(target, onclause)
+    return query.where(condition).subquery(name)
+
+
+TASK_COLUMN = (BColumn, BColumn.id == Task.column_id)
+
+
+def _tree_stats(condition) -> list:
+    return [
+        _stats("column_stats", BColumn.last_updated_at, condition),
+        _stats("task_stats", Task.last_updated_at, condition, TASK_COLUMN),
+        _stats("assignee_stats", TaskAssignee.assigned_at, condition, (Task, Task.id == TaskAssignee.task_id), TASK_COLUMN),
+    ]
+
+
+def _log_stats(condition):
+    # latest_log и log_count есть в задачах колонок, но не в доске
+    return _stats("log_stats", TaskLog.created_at, condition, (Task, Task.id == TaskLog.task_id), TASK_COLUMN)
+
+
+def _user_stats(condition):
+    # доска встраивает профили исполнителей: их правка тоже меняет ответ
+    return _stats(
+        "user_stats", User.last_updated_at, condition,
+        (TaskAssignee, TaskAssignee.user_id == User.id), (Task, Task.id == TaskAssignee.task_id), TASK_COLUMN
+    )
+
+
+def _task_stats(task_id: UUID) -> list:
+    return [
+        _stats("assignee_stats", TaskAssignee.assigned_at, TaskAssignee.task_id == task_id),
+        _stats("log_stats", TaskLog.created_at, TaskLog.task_id == task_id),
+    ]
+
+
+async def _fetch(session: AsyncSession, stats: list, model=None, anchor=None, condition=None) -> tuple | None:
+    columns = [column for subquery in stats for column in (subquery.c.changed_at, subquery.c.total)]
+    if model is None:
+        query = select(*columns).select_from(stats[0])
+        stats = stats[1:]
+    else:
+        query = select(anchor, *columns).select_from(model).where(condition)
+    for subquery in stats:
+        query = query.join(subquery, true())
+    row = (await session.execute(query)).first()
+    return tuple(row) if row is not None else None
+
+
+async def get_project_version(session: AsyncSession, project_id: UUID) -> tuple | None:
+    result = await session.execute(select(Project.last_updated_at).where(Project.id == project_id))
+    row = result.first()
+    return tuple(row) if row is not None else None
+
+
+async def get_board_version(session: AsyncSession, project_id: UUID) -> tuple | None:
+    condition = BColumn.project_id == project_id
+    return await _fetch(
+        session, [*_tree_stats(condition), _user_stats(condition)],
+        Project, Project.last_updated_at, Project.id == project_id
+    )
+
+
+async def get_project_columns_version(session: AsyncSession, project_id: UUID) -> tuple | None:
+    condition = BColumn.project_id == project_id
+    return await _fetch(session, [*_tree_stats(condition), _log_stats(condition)])
+
+
+async def get_column_version(session: AsyncSession, column_id: UUID) -> tuple | None:
+    condition = BColumn.id == column_id
+    return await _fetch(
+        session, [*_tree_stats(condition), _log_stats(condition)],
+        BColumn, BColumn.last_updated_at, BColumn.id == column_id
+    )
+
+
+async def get_task_version(session: AsyncSession, task_id: UUID) -> tuple | None:
+    return await _fetch(session, _task_stats(task_id), Task, Task.last_updated_at, Task.id == task_id)
@@ -1,17 +1,91 @@
+import asyncio
+import os
+import shutil
+import tempfile
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from src.settings import settings
 from src.routers import router
+from src.core.database import engine, replica_engines
+from src.core.replicas import ReadYourWritesMiddleware
+from src.core.compression import CompressionMiddleware
+from src.core.instrumentation import QueryStatsMiddleware
+from src.core.metrics import MetricsMiddleware, mark_worker_dead
+from src.crud.log_retention import log_maintenance_worker
+from src.crud.log_buffer import log_buffer
+from src.core.hashing import shutdown_hashing_executor
+from src.core.events import event_hub
 
-app = FastAPI(debug=settings.SERVER_TEST)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # секции task_logs на следующие месяцы нужны всегда, не только при настроенном сроке хранения
+    maintenance_task = asyncio.create_task(log_maintenance_worker())
+    if settings.LOG_WRITE_BEHIND:
+        log_buffer.start()
+    yield
+    maintenance_task.cancel()
+    # оставшиеся в буфере логи дописываются до закрытия пула
+    await log_buffer.stop()
+    await event_hub.stop()
+    shutdown_hashing_executor()
+    await engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
+    mark_worker_dead()
+
+
+app = FastAPI(debug=settings.SERVER_TEST, lifespan=lifespan)
+app.add_middleware(ReadYourWritesMiddleware)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+# внешним слоем: в total попадает и время сжатия
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 app.include_router(router)
 
-if __name__ == "__main__":
+
+def prepare_metrics_dir() -> None:
+    # каталог должен быть задан до импорта prometheus_client в воркерах и пуст на старте
+    path = settings.METRICS_MULTIPROC_DIR or os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+    else:
+        path = tempfile.mkdtemp(prefix="prometheus-")
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+
+
+def run():
+    if settings.SERVER_TEST:
+        uvicorn.run(
+            "src.main:app",
+            host=settings.SERVER_ADDR,
+            port=settings.SERVER_PORT,
+            log_level="debug",
+            reload=True
+        )
+        return
+
+    if settings.METRICS_ENABLED and settings.server_workers > 1:
+        prepare_metrics_dir()
+
+    # loop/http="auto" выбирают uvloop и httptools, если они установлены
     uvicorn.run(
         "src.main:app",
         host=settings.SERVER_ADDR,
         port=settings.SERVER_PORT,
-        log_level="debug" if settings.SERVER_TEST else "info",
-        reload=True
+        log_level="info",
+        workers=settings.server_workers,
+        loop="auto",
+        http="auto",
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT
     )
+
+
+if __name__ == "__main__":
+    run()
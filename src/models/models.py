@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Table
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, BigInteger, Table, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy.orm import relationship, synonym, Mapped, mapped_column
 from datetime import datetime
 import uuid
 from src.core.database import Base
@@ -36,21 +36,41 @@ class Project(Base):
 
 class BColumn(Base):
     __tablename__ = "columns"
+    __table_args__ = (
+        UniqueConstraint(
+            "project_id", "order", name="uq_columns_project_id_order", deferrable=True, initially="IMMEDIATE"
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(50), nullable=False)
     description: Mapped[str] = mapped_column(Text)
-    order: Mapped[int] = mapped_column(Integer, nullable=False)
+    order: Mapped[int] = mapped_column(BigInteger, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
     last_updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
 
     project = relationship("Project", back_populates="columns")
-    tasks = relationship("Task", back_populates="column", cascade="all, delete-orphan")
+    tasks = relationship("Task", back_populates="column", cascade="all, delete-orphan", order_by="Task.order")
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        UniqueConstraint(
+            "column_id", "order", name="uq_tasks_column_id_order", deferrable=True, initially="IMMEDIATE"
+        ),
+        Index("ix_tasks_column_id_priority", "column_id", "priority", "id"),
+        Index("ix_tasks_column_id_created_at", "column_id", "created_at", "id"),
+        Index("ix_tasks_column_id_last_updated_at", "column_id", "last_updated_at", "id"),
+        Index("ix_tasks_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index(
+            "ix_tasks_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"}
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     column_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("columns.id"), nullable=False)
@@ -58,16 +78,22 @@ class Task(Base):
     description: Mapped[str] = mapped_column(Text)
     status: Mapped[str] = mapped_column(String(20), default="active")
     priority: Mapped[int] = mapped_column(Integer, default=5)
+    order: Mapped[int] = mapped_column(BigInteger, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
     last_updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
 
     column = relationship("BColumn", back_populates="tasks")
     assignees = relationship("User", secondary="task_assignees", back_populates="assigned_tasks")
+    users = synonym("assignees")
     logs = relationship("TaskLog", back_populates="task", cascade="all, delete-orphan")
 
 
 class TaskAssignee(Base):
     __tablename__ = "task_assignees"
+    __table_args__ = (
+        UniqueConstraint("task_id", "user_id", name="uq_task_assignees_task_id_user_id"),
+        Index("ix_task_assignees_user_id", "user_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     task_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tasks.id"), nullable=False)
@@ -76,18 +102,42 @@ class TaskAssignee(Base):
 
 
 class TaskLog(Base):
+    # секционирована по месяцам created_at (task_logs_pYYYYMM + task_logs_default),
+    # поэтому created_at входит в первичный ключ
     __tablename__ = "task_logs"
+    __table_args__ = (
+        Index("ix_task_logs_task_id_created_at", "task_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     task_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tasks.id"), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=datetime.now)
 
     task = relationship("Task", back_populates="logs")
 
 
+class TaskLogArchive(Base):
+    # истекшие секции task_logs: те же колонки без внешнего ключа, BRIN вместо btree
+    __tablename__ = "task_logs_archive"
+    __table_args__ = (
+        Index("ix_task_logs_archive_created_at", "created_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    task_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+
+
 class ProjectUser(Base):
     __tablename__ = "project_users"
+    __table_args__ = (
+        UniqueConstraint("project_id", "user_id", name="uq_project_users_project_id_user_id"),
+        Index("ix_project_users_user_id", "user_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id"), nullable=False)
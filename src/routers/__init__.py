@@ -1,10 +1,17 @@
 from fastapi import APIRouter
-from . import auth_router, project_router, user_router, column_router, task_router
+from . import (
+    auth_router, project_router, user_router, column_router, task_router, health_router, events_router, metrics_router
+)
+from src.settings import settings
 
 router = APIRouter()
 
 router.include_router(auth_router.router, prefix="/auth", tags=["auth"])
 router.include_router(project_router.router, prefix="/projects", tags=["projects"])
+router.include_router(events_router.router, prefix="/projects", tags=["events"])
 router.include_router(user_router.router, prefix="/users", tags=["users"])
 router.include_router(column_router.router, prefix="/columns", tags=["columns"])
-router.include_router(task_router.router, prefix="/tasks", tags=["tasks"])
\ No newline at end of file
+router.include_router(task_router.router, prefix="/tasks", tags=["tasks"])
+router.include_router(health_router.router, prefix="/health", tags=["health"])
+if settings.METRICS_ENABLED:
+    router.include_router(metrics_router.router, tags=["metrics"])
\ No newline at end of file
@@ -6,17 +6,15 @@ from src.core.database import AsyncSessionLocal
 from src.models.models import User
 from src.core.database import get_db
 from src.crud.user import get_user_by_email
+from src.core.hashing import hash_password, verify_password
 from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from passlib.context import CryptContext
 import uuid
 
 router = APIRouter()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 @router.post("/register", response_model=Token)
 async def register_user(user_data: UserRegister):
     async with AsyncSessionLocal() as session:
@@ -27,7 +25,7 @@ async def register_user(user_data: UserRegister):
         if existing_user:
             raise HTTPException(status_code=400, detail="Email already registered")
 
-        hashed_password = pwd_context.hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
 
         new_user = User(
             id=uuid.uuid4(),
@@ -55,7 +53,7 @@ async def login_user(
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email")
 
-    if not pwd_context.verify(login_data.password, user.password):
+    if not await verify_password(login_data.password, user.password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect password")
 
     access_token = create_access_token(data={"sub": str(user.id)})
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.schemas.column import ColumnCreate, ColumnUpdate, ColumnOut
+from src.schemas.column import ColumnCreate, ColumnUpdate, ColumnMove, ColumnOut
 from src.crud import column as column_crud
-from src.security import get_current_user
+from src.crud.ordering import MissingReference
+from src.crud import versions as version_crud
+from src.core.conditional import not_modified
+from src.security import get_current_user, project_access, column_access, authorize_projects
 from src.core.database import get_db
+from src.core.replicas import get_read_db
 from src.models.models import User
+from src.core.includes import task_include
 
 router = APIRouter()
 
@@ -17,16 +22,29 @@ async def create_column(
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await column_crud.create_column(session, column_data)
+    await authorize_projects(session, current_user.id, [column_data.project_id])
+    try:
+        return await column_crud.create_column(session, column_data)
+    except MissingReference as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.get("/{column_id}", response_model=ColumnOut)
 async def read_column(
     column_id: UUID,
-    session: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    include: frozenset[str] = Depends(task_include),
+    session: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(column_access())
 ):
-    column = await column_crud.get_column_by_id(session, column_id)
+    state = await version_crud.get_column_version(session, column_id)
+    cached = not_modified(request, response, state, sorted(include))
+    if cached:
+        return cached
+    column = await column_crud.get_column_by_id(session, column_id, include)
     if not column:
         raise HTTPException(status_code=404, detail="Column not found")
     return column
@@ -35,30 +53,60 @@ async def read_column(
 @router.get("/project/{project_id}", response_model=list[ColumnOut])
 async def get_columns_by_project(
     project_id: UUID,
-    session: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    include: frozenset[str] = Depends(task_include),
+    session: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(project_access())
 ):
-    return await column_crud.get_columns_by_project(session, project_id)
+    state = await version_crud.get_project_columns_version(session, project_id)
+    cached = not_modified(request, response, state, sorted(include))
+    if cached:
+        return cached
+    return await column_crud.get_columns_by_project(session, project_id, include)
 
 
 @router.put("/{column_id}", response_model=ColumnOut)
 async def update_column(
     column_id: UUID,
     column_data: ColumnUpdate,
+    include: frozenset[str] = Depends(task_include),
     session: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(column_access(get_session=get_db))
 ):
-    updated_column = await column_crud.update_column(session, column_id, column_data)
+    try:
+        updated_column = await column_crud.update_column(session, column_id, column_data, include)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not updated_column:
         raise HTTPException(status_code=404, detail="Column not found")
     return updated_column
 
 
+@router.post("/{column_id}/move", response_model=ColumnOut)
+async def move_column(
+    column_id: UUID,
+    move: ColumnMove,
+    include: frozenset[str] = Depends(task_include),
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(column_access(get_session=get_db))
+):
+    try:
+        column = await column_crud.move_column(session, column_id, move, include)
+    except MissingReference as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not column:
+        raise HTTPException(status_code=404, detail="Column not found")
+    return column
+
+
 @router.delete("/{column_id}")
 async def delete_column(
     column_id: UUID,
     session: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(column_access(get_session=get_db))
 ):
     success = await column_crud.delete_column(session, column_id)
     if not success:
@@ -0,0 +1,92 @@
+import asyncio
+import json
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.settings import settings
+from src.models.models import User
+from src.core.database import get_db, AsyncSessionLocal
+from src.core.events import event_hub
+from src.security import get_token_user_id, project_access, authorize_projects
+from src.crud import project as project_crud
+
+router = APIRouter()
+
+
+async def sse_events(project_id: UUID):
+    # подписка создается внутри генератора: finally гарантированно снимет ее при обрыве соединения
+    subscription = event_hub.subscribe(project_id)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), settings.EVENTS_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        event_hub.unsubscribe(subscription)
+
+
+@router.get("/{project_id}/events")
+async def project_events(
+        project_id: UUID,
+        session: AsyncSession = Depends(get_db),
+        current_user: User = Depends(project_access(get_session=get_db))
+):
+    if not settings.EVENTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Change feed is disabled")
+    project = await project_crud.get_project_by_id(session, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return StreamingResponse(
+        sse_events(project_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/{project_id}/events/ws")
+async def project_events_ws(websocket: WebSocket, project_id: UUID, token: str = Query(...)):
+    # браузер не передает заголовки при открытии WebSocket, поэтому токен приходит в query
+    if not settings.EVENTS_ENABLED:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    # короткая сессия: соединение из пула не должно жить столько же, сколько WebSocket
+    async with AsyncSessionLocal() as session:
+        try:
+            await authorize_projects(session, get_token_user_id(token), [project_id])
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        project = await project_crud.get_project_by_id(session, project_id)
+    if not project:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = event_hub.subscribe(project_id)
+
+    async def send_events():
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), settings.EVENTS_KEEPALIVE)
+            except asyncio.TimeoutError:
+                event = {"type": "ping"}
+            await websocket.send_text(json.dumps(event))
+
+    async def wait_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = {asyncio.create_task(send_events()), asyncio.create_task(wait_disconnect())}
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        event_hub.unsubscribe(subscription)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+
+from src.core.database import get_pool_stats
+from src.models.models import User
+from src.security import get_current_user
+
+router = APIRouter()
+
+
+@router.get("/pool")
+async def pool_stats(current_user: User = Depends(get_current_user)):
+    # размеры пулов и топология реплик - внутренние сведения, анонимно не отдаются
+    return get_pool_stats()
@@ -0,0 +1,31 @@
+from secrets import compare_digest
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from src.core.metrics import render_metrics
+from src.settings import settings
+
+router = APIRouter()
+scrape_bearer = HTTPBearer(auto_error=False)
+
+
+def require_scrape_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(scrape_bearer)) -> None:
+    # пулы, кэши и очередь bcrypt - внутренние сведения: без METRICS_TOKEN отдавать их некому
+    if (
+        settings.METRICS_TOKEN is None
+        or credentials is None
+        or not compare_digest(credentials.credentials.encode(), settings.METRICS_TOKEN.encode())
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid scrape token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_scrape_token)])
+async def metrics():
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
@@ -1,13 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from typing import Optional
 
 from src.schemas.project import ProjectCreate, ProjectUpdate, ProjectOut
 from src.schemas.user import UserOut
+from src.schemas.board import BoardOut
+from src.schemas.task import TaskSummaryOut
+from src.schemas.pagination import Page
+from src.schemas.board_import import ImportReport
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from src.models.models import User
 from src.core.database import get_db
-from src.security import get_current_user
+from src.core.replicas import get_read_db
+from src.security import get_current_user, project_access
+from src.crud.access import OWNER
 from src.crud import project as project_crud
+from src.crud import board as board_crud
+from src.crud import task as task_crud
+from src.crud import export as export_crud
+from src.crud import importer as import_crud
+from src.crud import versions as version_crud
+from src.core.conditional import not_modified
+from src.core.serialization import RawJSONResponse
+from src.core.includes import task_include
 
 router = APIRouter()
 
@@ -19,36 +36,117 @@ async def create_project(
         current_user: User = Depends(get_current_user)
 ):
     project = await project_crud.create_project(session, project_data)
-    await project_crud.add_user_to_project(session, project.id, current_user.id)
+    await project_crud.add_user_to_project(session, project.id, current_user.id, role=OWNER)
     return project
 
 
-@router.get("/", response_model=list[ProjectOut])
-async def get_all_projects(
+@router.post("/import", response_model=ImportReport)
+async def import_projects(
+        request: Request,
+        response: Response,
+        format: str = Query("ndjson", regex="^(ndjson|csv)$"),
         session: AsyncSession = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ):
-    return await project_crud.get_all_projects(session)
+    # тело читается потоком: в памяти только текущая пачка строк
+    records = import_crud.parse_records(import_crud.iter_lines(request.stream()), format)
+    report = await import_crud.import_records(session, records, owner_id=current_user.id, enforce_access=True)
+    if not report.committed:
+        response.status_code = 409
+    return report
+
+
+@router.get("/", response_model=Page[ProjectOut])
+async def get_all_projects(
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None),
+        session: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(get_current_user)
+):
+    projects, next_cursor = await project_crud.get_all_projects(
+        session, current_user.id, limit=limit, cursor=cursor
+    )
+    return {"items": projects, "next_cursor": next_cursor}
 
 
 @router.get("/{project_id}", response_model=ProjectOut)
 async def get_project(
         project_id: UUID,
-        session: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user)
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(project_access())
 ):
+    cached = not_modified(request, response, await version_crud.get_project_version(session, project_id))
+    if cached:
+        return cached
     project = await project_crud.get_project_by_id(session, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 
+@router.get("/{project_id}/board", response_model=BoardOut)
+async def get_project_board(
+        project_id: UUID,
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(project_access())
+):
+    # клиенты опрашивают доску каждые несколько секунд: версия считается без сборки JSON
+    cached = not_modified(request, response, await version_crud.get_board_version(session, project_id))
+    if cached:
+        return cached
+    board = await board_crud.get_project_board(session, project_id)
+    if board is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    # JSON доски собран в Postgres по форме BoardOut и отдается как есть
+    return RawJSONResponse(board, headers=response.headers)
+
+
+@router.get("/{project_id}/tasks/search", response_model=list[TaskSummaryOut])
+async def search_project_tasks(
+        project_id: UUID,
+        q: str = Query(..., min_length=1, max_length=100),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        include: frozenset[str] = Depends(task_include),
+        session: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(project_access())
+):
+    return await task_crud.search_project_tasks(session, project_id, q, limit=limit, include=include)
+
+
+@router.get("/{project_id}/export")
+async def export_project(
+        project_id: UUID,
+        format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+        session: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(project_access())
+):
+    project = await project_crud.get_project_by_id(session, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    if format == "csv":
+        return StreamingResponse(
+            export_crud.export_csv(project_id, current_user.id),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="project-{project_id}.csv"'}
+        )
+    return StreamingResponse(
+        export_crud.export_ndjson(project_id, current_user.id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}.ndjson"'}
+    )
+
+
 @router.put("/{project_id}", response_model=ProjectOut)
 async def update_project(
         project_id: UUID,
         project_data: ProjectUpdate,
         session: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(project_access(OWNER, get_db))
 ):
     updated_project = await project_crud.update_project(session, project_id, project_data)
     if not updated_project:
@@ -60,7 +158,7 @@ async def update_project(
 async def delete_project(
         project_id: UUID,
         session: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(project_access(OWNER, get_db))
 ):
     success = await project_crud.delete_project(session, project_id)
     if not success:
@@ -73,7 +171,7 @@ async def add_user(
         project_id: UUID,
         user_id: UUID,
         session: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(project_access(OWNER, get_db))
 ):
     await project_crud.add_user_to_project(session, project_id, user_id)
     return {"detail": "User added to project"}
@@ -84,17 +182,19 @@ async def remove_user(
         project_id: UUID,
         user_id: UUID,
         session: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(project_access(OWNER, get_db))
 ):
     await project_crud.remove_user_from_project(session, project_id, user_id)
     return {"detail": "User removed from project"}
 
 
-@router.get("/{project_id}/users", response_model=list[UserOut])
+@router.get("/{project_id}/users", response_model=Page[UserOut])
 async def list_project_users(
         project_id: UUID,
-        session: AsyncSession = Depends(get_db),
-        user: User = Depends(get_current_user)
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None),
+        session: AsyncSession = Depends(get_read_db),
+        user: User = Depends(project_access())
 ):
-    users = await project_crud.get_project_users(session, project_id)
-    return users
+    users, next_cursor = await project_crud.get_project_users(session, project_id, limit=limit, cursor=cursor)
+    return {"items": users, "next_cursor": next_cursor}
@@ -1,68 +1,200 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from uuid import UUID
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.schemas.user import UserOut
-from src.schemas.task import TaskCreate, TaskUpdate, TaskOut
+from src.schemas.task import (
+    TaskCreate, TaskUpdate, TaskMove, TaskSummaryOut,
+    TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete, TaskBulkAssign, TaskBulkResult
+)
 from src.schemas.task_log import TaskLogOut
+from src.schemas.pagination import Page
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.core.includes import task_include
 from src.core.database import get_db
-from src.security import get_current_user
+from src.core.replicas import get_read_db
+from src.security import get_current_user, column_access, task_access, authorize_columns, authorize_tasks
 from src.models.models import User
 from src.crud import task as task_crud
+from src.crud import task_bulk as task_bulk_crud
+from src.crud.ordering import MissingReference
+from src.crud import versions as version_crud
+from src.core.conditional import not_modified
+from src.core.serialization import FastJSONResponse
 
 router = APIRouter()
 
 
-@router.post("/", response_model=TaskOut)
+@router.post("/", response_model=TaskSummaryOut)
 async def create_task(
     task_data: TaskCreate,
+    include: frozenset[str] = Depends(task_include),
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await task_crud.create_task(session, task_data)
+    await authorize_columns(session, current_user.id, [task_data.column_id])
+    try:
+        return await task_crud.create_task(session, task_data, include)
+    except MissingReference as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
-@router.get("/{task_id}", response_model=TaskOut)
-async def get_task(
-    task_id: UUID,
+@router.post("/bulk", response_model=TaskBulkResult)
+async def bulk_create_tasks(
+    data: TaskBulkCreate,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    await authorize_columns(session, current_user.id, [task.column_id for task in data.tasks])
+    try:
+        ids = await task_bulk_crud.bulk_create_tasks(session, data.tasks)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return TaskBulkResult(count=len(ids), ids=ids)
+
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def bulk_update_tasks(
+    data: TaskBulkUpdate,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    await authorize_tasks(session, current_user.id, [task.id for task in data.tasks])
+    await authorize_columns(session, current_user.id, [task.column_id for task in data.tasks if task.column_id])
+    try:
+        ids = await task_bulk_crud.bulk_update_tasks(session, data.tasks)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return TaskBulkResult(count=len(ids), ids=ids)
+
+
+@router.post("/bulk/delete", response_model=TaskBulkResult)
+async def bulk_delete_tasks(
+    data: TaskBulkDelete,
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    task = await task_crud.get_task_by_id(session, task_id)
+    await authorize_tasks(session, current_user.id, data.ids)
+    ids = await task_bulk_crud.bulk_delete_tasks(session, data.ids)
+    return TaskBulkResult(count=len(ids), ids=ids)
+
+
+@router.post("/bulk/assign", response_model=TaskBulkResult)
+async def bulk_assign_users(
+    data: TaskBulkAssign,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    await authorize_tasks(session, current_user.id, [assignment.task_id for assignment in data.assignments])
+    try:
+        ids = await task_bulk_crud.bulk_assign_users(session, data.assignments)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return TaskBulkResult(count=len(ids), ids=ids)
+
+
+@router.post("/bulk/unassign", response_model=TaskBulkResult)
+async def bulk_unassign_users(
+    data: TaskBulkAssign,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    await authorize_tasks(session, current_user.id, [assignment.task_id for assignment in data.assignments])
+    ids = await task_bulk_crud.bulk_unassign_users(session, data.assignments)
+    return TaskBulkResult(count=len(ids), ids=ids)
+
+
+@router.get("/{task_id}", response_model=TaskSummaryOut)
+async def get_task(
+    task_id: UUID,
+    request: Request,
+    response: Response,
+    include: frozenset[str] = Depends(task_include),
+    session: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(task_access())
+):
+    state = await version_crud.get_task_version(session, task_id)
+    cached = not_modified(request, response, state, sorted(include))
+    if cached:
+        return cached
+    task = await task_crud.get_task_by_id(session, task_id, include)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 
-@router.get("/column/{column_id}", response_model=List[TaskOut])
+@router.get("/column/{column_id}", response_model=Page[TaskSummaryOut])
 async def get_tasks_by_column(
     column_id: UUID,
     name_contains: Optional[str] = Query(None),
     user_id: Optional[UUID] = Query(None),
     sort_by_create_time: Optional[str] = Query(None, regex="^(asc|desc)$"),
     sort_by_update_time: Optional[str] = Query(None,regex="^(asc|desc)$"),
-    session: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    sort_by_priority: Optional[str] = Query(None, regex="^(asc|desc)$"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    include: frozenset[str] = Depends(task_include),
+    session: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(column_access())
 ):
-    return await task_crud.get_tasks_by_column(
+    tasks, next_cursor = await task_crud.get_tasks_by_column(
         session,
         column_id,
         name_contains=name_contains,
         user_id=user_id,
         sort_by_create_time=sort_by_create_time,
-        sort_by_update_time=sort_by_update_time
+        sort_by_update_time=sort_by_update_time,
+        sort_by_priority=sort_by_priority,
+        limit=limit,
+        cursor=cursor,
+        include=include
     )
+    # строки уже в форме TaskSummaryOut: response_model остается только для документации
+    return FastJSONResponse({"items": tasks, "next_cursor": next_cursor})
 
 
-@router.put("/{task_id}", response_model=TaskOut)
+@router.put("/{task_id}", response_model=TaskSummaryOut)
 async def update_task(
     task_id: UUID,
     task_data: TaskUpdate,
+    include: frozenset[str] = Depends(task_include),
     session: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(task_access(get_session=get_db))
 ):
-    task = await task_crud.update_task(session, task_id, task_data)
+    if task_data.column_id:
+        # перенос в колонку другого проекта требует доступа и к нему
+        await authorize_columns(session, current_user.id, [task_data.column_id])
+    try:
+        task = await task_crud.update_task(session, task_id, task_data, include)
+    except MissingReference as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+@router.post("/{task_id}/move", response_model=TaskSummaryOut)
+async def move_task(
+    task_id: UUID,
+    move: TaskMove,
+    include: frozenset[str] = Depends(task_include),
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(task_access(get_session=get_db))
+):
+    if move.column_id:
+        await authorize_columns(session, current_user.id, [move.column_id])
+    try:
+        task = await task_crud.move_task(session, task_id, move, include)
+    except MissingReference as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
@@ -72,7 +204,7 @@ async def update_task(
 async def delete_task(
     task_id: UUID,
     session: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(task_access(get_session=get_db))
 ):
     success = await task_crud.delete_task(session, task_id)
     if not success:
@@ -85,7 +217,7 @@ async def add_user_to_task(
     task_id: UUID,
     user_id: UUID,
     session: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(task_access(get_session=get_db))
 ):
     await task_crud.add_user_to_task(session, task_id, user_id)
     return {"detail": "User added to task"}
@@ -96,26 +228,40 @@ async def remove_user_from_task(
     task_id: UUID,
     user_id: UUID,
     session: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(task_access(get_session=get_db))
 ):
     await task_crud.remove_user_from_task(session, task_id, user_id)
     return {"detail": "User removed from task"}
 
 
-@router.get("/{task_id}/logs", response_model=List[TaskLogOut])
+@router.get("/{task_id}/logs", response_model=Page[TaskLogOut])
 async def get_logs_for_task(
     task_id: UUID,
-    session: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    session: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(task_access())
 ):
-    return await task_crud.get_task_logs(session, task_id)
+    logs, next_cursor = await task_crud.get_task_logs(
+        session,
+        task_id,
+        since=since,
+        until=until,
+        limit=limit,
+        cursor=cursor
+    )
+    return {"items": logs, "next_cursor": next_cursor}
 
 
-@router.get("/{task_id}/users", response_model=list[UserOut])
+@router.get("/{task_id}/users", response_model=Page[UserOut])
 async def get_task_users(
     task_id: UUID,
-    session: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    session: AsyncSession = Depends(get_read_db),
+    user: User = Depends(task_access())
 ):
-    users = await task_crud.get_users_by_task(session, task_id)
-    return users
\ No newline at end of file
+    users, next_cursor = await task_crud.get_users_by_task(session, task_id, limit=limit, cursor=cursor)
+    return {"items": users, "next_cursor": next_cursor}
\ No newline at end of file
@@ -1,24 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from typing import Optional
 
 from src.schemas.user import UserOut, UserUpdate
+from src.schemas.pagination import Page
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from src.crud import user as user_crud
-from src.security import get_current_user
+from src.security import get_current_user, get_current_db_user
 from src.core.database import get_db
+from src.core.replicas import get_read_db
+from src.core.serialization import FastJSONResponse
 from src.models.models import User
 
 router = APIRouter()
 
 @router.get("/me", response_model=UserOut)
 async def read_current_user(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_db_user)
 ):
     return current_user
 
 
 @router.get("/{user_id}", response_model=UserOut)
-async def read_user(user_id: UUID, session: AsyncSession = Depends(get_db)):
+async def read_user(user_id: UUID, session: AsyncSession = Depends(get_read_db)):
     db_user = await user_crud.get_user_by_id(user_id, session)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -50,9 +55,12 @@ async def delete_user(
     return {"detail": "User deleted successfully"}
 
 
-@router.get("/", response_model=list[UserOut])
+@router.get("/", response_model=Page[UserOut])
 async def list_users(
-    session: AsyncSession = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    session: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await user_crud.get_all_users(session)
\ No newline at end of file
+    users, next_cursor = await user_crud.get_all_users(session, limit=limit, cursor=cursor)
+    return FastJSONResponse({"items": users, "next_cursor": next_cursor})
@@ -0,0 +1,39 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import Optional, List
+
+from src.schemas.user import UserOut
+
+
+class BoardTaskOut(BaseModel):
+    id: UUID
+    column_id: UUID
+    order: int
+    title: str
+    description: Optional[str] = None
+    status: Optional[str] = None
+    priority: Optional[int] = None
+    created_at: datetime
+    last_updated_at: datetime
+    users: List[UserOut] = []
+
+
+class BoardColumnOut(BaseModel):
+    id: UUID
+    project_id: UUID
+    name: str
+    description: Optional[str] = None
+    order: int
+    created_at: datetime
+    last_updated_at: datetime
+    tasks: List[BoardTaskOut] = []
+
+
+class BoardOut(BaseModel):
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    created_at: datetime
+    last_updated_at: datetime
+    columns: List[BoardColumnOut] = []
@@ -0,0 +1,55 @@
+from pydantic import BaseModel, field_validator
+from uuid import UUID
+from datetime import datetime
+from typing import Optional, List, Dict
+
+from src.schemas.project import ProjectCreate
+from src.schemas.column import ColumnCreate
+from src.schemas.task import TaskCreate
+from src.schemas.task_log import TaskLogCreate
+
+
+class ImportedProject(ProjectCreate):
+    id: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+
+
+class ImportedColumn(ColumnCreate):
+    id: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+
+
+class ImportedTask(TaskCreate):
+    id: Optional[UUID] = None
+    order: Optional[int] = None
+    assignee_ids: List[UUID] = []
+    created_at: Optional[datetime] = None
+
+    @field_validator("assignee_ids", mode="before")
+    @classmethod
+    def split_assignee_ids(cls, value):
+        # в CSV список исполнителей приходит строкой "id1;id2"
+        if isinstance(value, str):
+            return [item for item in value.split(";") if item]
+        return value or []
+
+
+class ImportedLog(TaskLogCreate):
+    id: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    committed: bool
+    rows_read: int
+    imported: Dict[str, int]
+    error_count: int
+    errors: List[ImportRowError] = []
+    fatal_error: Optional[str] = None
+    duration_seconds: float
+    rows_per_second: float
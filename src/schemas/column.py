@@ -3,7 +3,7 @@ from uuid import UUID
 from datetime import datetime
 from typing import Optional, List
 
-from src.schemas.task import TaskOut
+from src.schemas.task import TaskSummaryOut
 
 
 class ColumnBase(BaseModel):
@@ -22,12 +22,17 @@ class ColumnUpdate(BaseModel):
     order: Optional[int] = None
 
 
+class ColumnMove(BaseModel):
+    # None - поставить колонку первой
+    after_id: Optional[UUID] = None
+
+
 class ColumnOut(ColumnBase):
     id: UUID
     project_id: UUID
     created_at: datetime
     last_updated_at: datetime
-    tasks: List[TaskOut] = []
+    tasks: List[TaskSummaryOut] = []
 
     class Config:
         from_attributes = True
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, constr
+from collections import Counter
+
+from pydantic import BaseModel, constr, conlist, field_validator
 from uuid import UUID
 from typing import Optional, List
 from datetime import datetime
@@ -26,13 +28,69 @@ class TaskUpdate(BaseModel):
     priority: Optional[int] = None
 
 
-class TaskOut(TaskBase):
+class TaskMove(BaseModel):
+    # column_id не задан - перемещение внутри текущей колонки; after_id None - в начало колонки
+    column_id: Optional[UUID] = None
+    after_id: Optional[UUID] = None
+
+
+class TaskSummaryOut(TaskBase):
     id: UUID
     column_id: UUID
+    order: int
     created_at: datetime
     last_updated_at: datetime
+    log_count: int = 0
+    latest_log: Optional[TaskLogOut] = None
+    # заполняются только при ?include=users / ?include=logs
     users: List[UserOut] = []
     logs: List[TaskLogOut] = []
 
     class Config:
         from_attributes = True
+
+
+MAX_BULK_SIZE = 1000
+
+
+class TaskBulkCreate(BaseModel):
+    tasks: conlist(TaskCreate, min_length=1, max_length=MAX_BULK_SIZE)
+
+
+class TaskBulkUpdateItem(BaseModel):
+    id: UUID
+    status: Optional[str] = None
+    priority: Optional[int] = None
+    column_id: Optional[UUID] = None
+
+
+class TaskBulkUpdate(BaseModel):
+    tasks: conlist(TaskBulkUpdateItem, min_length=1, max_length=MAX_BULK_SIZE)
+
+    @field_validator("tasks")
+    @classmethod
+    def unique_ids(cls, value):
+        # UPDATE ... FROM (VALUES ...) применил бы для повторяющегося id произвольную из строк
+        counts = Counter(item.id for item in value)
+        duplicates = sorted(str(task_id) for task_id, count in counts.items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Duplicate task ids: {', '.join(duplicates)}")
+        return value
+
+
+class TaskBulkDelete(BaseModel):
+    ids: conlist(UUID, min_length=1, max_length=MAX_BULK_SIZE)
+
+
+class TaskAssignment(BaseModel):
+    task_id: UUID
+    user_id: UUID
+
+
+class TaskBulkAssign(BaseModel):
+    assignments: conlist(TaskAssignment, min_length=1, max_length=MAX_BULK_SIZE)
+
+
+class TaskBulkResult(BaseModel):
+    count: int
+    ids: List[UUID] = []
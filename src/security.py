@@ -1,31 +1,137 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from typing import Iterable
 
 from src.core.jwt_utils import decode_access_token
 from src.settings import settings
 from src.core.database import get_db
+from src.core.replicas import get_read_db
 from src.models.models import User
-from src.crud.user import get_user_by_id
+from src.crud.user import get_user_by_id, principal_cache
+from src.crud import access as access_crud
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-async def get_current_user(
-        token: str = Depends(oauth2_scheme),
+def get_token_user_id(token: str = Depends(oauth2_scheme)) -> UUID:
+    payload = decode_access_token(token)
+    if payload is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    try:
+        return UUID(user_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+
+async def get_current_db_user(
+        user_id: UUID = Depends(get_token_user_id),
         session: AsyncSession = Depends(get_db)
 ) -> User:
-    try:
-        payload = decode_access_token(token)
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    user = principal_cache.get(user_id)
+    if user is not None:
+        return user
 
-    user = await get_user_by_id(UUID(user_id), session)
+    user = await get_user_by_id(user_id, session)
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    # в кэш кладется отсоединенный объект, чтобы запросы не делили его через identity map сессии
+    session.expunge(user)
+    principal_cache.set(user_id, user)
     return user
+
+
+async def get_current_user(
+        user_id: UUID = Depends(get_token_user_id),
+        session: AsyncSession = Depends(get_db)
+) -> User:
+    if settings.AUTH_STATELESS:
+        # проверенной подписи токена достаточно для авторизации, без обращения к БД
+        return User(id=user_id)
+    return await get_current_db_user(user_id, session)
+
+
+async def authorize_projects(
+        session: AsyncSession,
+        user_id: UUID,
+        project_ids: Iterable[UUID],
+        role: str = access_crud.MEMBER
+) -> None:
+    required = access_crud.ROLE_LEVELS[role]
+
+    def denied(roles: dict[UUID, str], ids: Iterable[UUID]) -> list[UUID]:
+        return [project_id for project_id in ids if access_crud.ROLE_LEVELS.get(roles.get(project_id), 0) < required]
+
+    missing = denied(await access_crud.get_project_roles(session, user_id), set(project_ids))
+    if not missing:
+        return
+    # доступ мог выдать другой воркер: перед отказом карта перечитывается из БД
+    if denied(await access_crud.get_project_roles(session, user_id, fresh=True), missing):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions for this project")
+
+
+async def authorize_columns(
+        session: AsyncSession,
+        user_id: UUID,
+        column_ids: Iterable[UUID],
+        role: str = access_crud.MEMBER
+) -> None:
+    # несуществующие колонки пропускаются: на них ответит сам обработчик
+    project_ids = await access_crud.get_column_project_ids(session, column_ids)
+    await authorize_projects(session, user_id, project_ids.values(), role)
+
+
+async def authorize_tasks(
+        session: AsyncSession,
+        user_id: UUID,
+        task_ids: Iterable[UUID],
+        role: str = access_crud.MEMBER
+) -> None:
+    project_ids = await access_crud.get_task_project_ids(session, task_ids)
+    await authorize_projects(session, user_id, project_ids.values(), role)
+
+
+def project_access(role: str = access_crud.MEMBER, get_session=get_read_db):
+    """Зависимость: текущий пользователь с ролью не ниже role в проекте из пути."""
+    async def dependency(
+            project_id: UUID,
+            current_user: User = Depends(get_current_user),
+            session: AsyncSession = Depends(get_session)
+    ) -> User:
+        await authorize_projects(session, current_user.id, [project_id], role)
+        return current_user
+    return dependency
+
+
+def column_access(role: str = access_crud.MEMBER, get_session=get_read_db):
+    async def dependency(
+            column_id: UUID,
+            current_user: User = Depends(get_current_user),
+            session: AsyncSession = Depends(get_session)
+    ) -> User:
+        project_ids = await access_crud.get_column_project_ids(session, [column_id])
+        if column_id not in project_ids:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Column not found")
+        await authorize_projects(session, current_user.id, project_ids.values(), role)
+        return current_user
+    return dependency
+
+
+def task_access(role: str = access_crud.MEMBER, get_session=get_read_db):
+    async def dependency(
+            task_id: UUID,
+            current_user: User = Depends(get_current_user),
+            session: AsyncSession = Depends(get_session)
+    ) -> User:
+        # task -> column -> project одним запросом по первичным ключам
+        project_ids = await access_crud.get_task_project_ids(session, [task_id])
+        if task_id not in project_ids:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+        await authorize_projects(session, current_user.id, project_ids.values(), role)
+        return current_user
+    return dependency
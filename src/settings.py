@@ -1,3 +1,6 @@
+import os
+from typing import Literal, Optional
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,6 +8,9 @@ class Settings(BaseSettings):
     SERVER_ADDR: str = "0.0.0.0"
     SERVER_PORT: int = 8000
     SERVER_TEST: bool = True
+    # боевой режим (SERVER_TEST=false): несколько воркеров uvicorn без reload
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_GRACEFUL_TIMEOUT: int = 30
 
     DB_HOST: str
     DB_USERNAME: str
@@ -13,6 +19,119 @@ class Settings(BaseSettings):
     DB_PORT: int
     SECRET_KEY: str
 
+    # пул соединений и параметры asyncpg; DB_ECHO по умолчанию включен только в тестовом режиме
+    DB_ECHO: Optional[bool] = None
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # общий лимит соединений на все воркеры (не больше max_connections в Postgres)
+    DB_MAX_CONNECTIONS: Optional[int] = None
+    # реплики для чтения (DSN через запятую); после записи пользователь читает с primary
+    # в течение DB_REPLICA_STICKY_SECONDS, недоступная реплика пропускается DB_REPLICA_RETRY_SECONDS
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_STICKY_SECONDS: float = 5
+    DB_REPLICA_RETRY_SECONDS: float = 30
+
+    # AUTH_STATELESS: доверять подписанному токену без чтения пользователя из БД
+    AUTH_STATELESS: bool = False
+    AUTH_CACHE_SIZE: int = 1024
+    AUTH_CACHE_TTL: int = 60
+    # карта {project_id: роль} пользователя; отзыв доступа в других воркерах вступает в силу за ACCESS_CACHE_TTL
+    ACCESS_CACHE_SIZE: int = 4096
+    ACCESS_CACHE_TTL: int = 30
+
+    # bcrypt выполняется вне event loop: HASH_EXECUTOR = thread | process
+    HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    HASH_WORKERS: int = 2
+    HASH_CONCURRENCY: int = 8
+
+    # task_logs секционирована по месяцам: секции создаются на LOG_PARTITIONS_AHEAD месяцев вперед,
+    # секции старше LOG_RETENTION_DAYS (None - хранить все) переносятся в архив (archive) или удаляются (drop)
+    LOG_RETENTION_DAYS: Optional[int] = None
+    LOG_PARTITIONS_AHEAD: int = 3
+    LOG_EXPIRED_PARTITIONS: Literal["archive", "drop"] = "archive"
+    LOG_ARCHIVE_INTERVAL: int = 3600
+    # write-behind: логи задач пишутся фоновой задачей пачками после commit запроса;
+    # при заполненной очереди лог пишется синхронно в транзакции запроса
+    LOG_WRITE_BEHIND: bool = False
+    LOG_BUFFER_SIZE: int = 10000
+    LOG_FLUSH_BATCH_SIZE: int = 500
+    LOG_FLUSH_INTERVAL: float = 1.0
+
+    # лента изменений досок: LISTEN/NOTIFY, одно выделенное соединение на воркер
+    EVENTS_ENABLED: bool = True
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_KEEPALIVE: int = 15
+
+    # сжатие ответов: gzip всегда, brotli - если установлен пакет brotli
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_CACHE_SIZE: int = 256
+    COMPRESSION_CACHE_TTL: int = 300
+
+    # учет SQL на запрос: Server-Timing и строка лога; бюджеты вида {"GET /tasks/{task_id}": 3}
+    # проверяются только при SERVER_TEST, QUERY_BUDGET_DEFAULT - для маршрутов без своего бюджета
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_BUDGETS: dict[str, int] = {}
+    QUERY_BUDGET_DEFAULT: Optional[int] = None
+    QUERY_REPEAT_WARNING: int = 10
+
+    # /metrics в формате Prometheus; при нескольких воркерах метрики собираются через каталог
+    # METRICS_MULTIPROC_DIR (по умолчанию временный), который очищается при запуске сервера.
+    # Prometheus передает METRICS_TOKEN как bearer-токен; пока он не задан, /metrics отвечает 401
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_TOKEN: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_connection_budget(self):
+        # max(1, ...) в db_pool_size молча превысил бы общий лимит: лучше не стартовать
+        if self.DB_MAX_CONNECTIONS is not None and self.db_connections_per_worker < 1:
+            listeners = " plus one LISTEN connection per worker" if self.EVENTS_ENABLED else ""
+            raise ValueError(
+                f"DB_MAX_CONNECTIONS={self.DB_MAX_CONNECTIONS} leaves no pool connections for "
+                f"{self.server_workers} workers{listeners}"
+            )
+        return self
+
+    @property
+    def server_workers(self) -> int:
+        if self.SERVER_TEST:
+            return 1
+        return self.SERVER_WORKERS or os.cpu_count() or 1
+
+    @property
+    def db_connections_per_worker(self) -> int:
+        # соединение слушателя LISTEN живет вне пула, но входит в общий лимит
+        return self.DB_MAX_CONNECTIONS // self.server_workers - int(self.EVENTS_ENABLED)
+
+    @property
+    def db_pool_size(self) -> int:
+        if self.DB_MAX_CONNECTIONS is None:
+            return self.DB_POOL_SIZE
+        return min(self.DB_POOL_SIZE, self.db_connections_per_worker)
+
+    @property
+    def db_max_overflow(self) -> int:
+        if self.DB_MAX_CONNECTIONS is None:
+            return self.DB_MAX_OVERFLOW
+        return max(0, min(self.DB_MAX_OVERFLOW, self.db_connections_per_worker - self.db_pool_size))
+
+    @property
+    def db_echo(self) -> bool:
+        return self.SERVER_TEST if self.DB_ECHO is None else self.DB_ECHO
+
+    @property
+    def db_replica_urls(self) -> list[str]:
+        urls = [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+        return [url.replace("postgresql://", "postgresql+asyncpg://", 1) for url in urls]
+
     @property
     def DATABASE_URL_asyncpg(self):
         return f"postgresql+asyncpg://{self.DB_USERNAME}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
@@ -23,6 +142,7 @@ class Settings(BaseSettings):
 
     class Config:
         env_file = ".env"
+        env_ignore_empty = True
 
 
 settings = Settings()
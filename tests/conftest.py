@@ -0,0 +1,12 @@
+import os
+
+# настройки читаются при импорте src: тестам без базы хватает заглушек
+for name, value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USERNAME": "test",
+    "DB_PASSWORD": "test",
+    "DB_NAME": "test",
+    "SECRET_KEY": "test-secret",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,277 @@
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Delete, Insert, Select
+from sqlalchemy.dialects import postgresql
+
+from src.core.database import get_db
+from src.core.replicas import get_read_db
+from src.crud import access as access_crud
+from src.crud import column as column_crud
+from src.crud import project as project_crud
+from src.crud import task as task_crud
+from src.crud import task_bulk as task_bulk_crud
+from src.crud.access import MEMBER, OWNER
+from src.crud.events import column_projects
+from src.main import app
+from src.models.models import BColumn, ProjectUser, Task, User
+from src.security import get_current_user
+from src.settings import settings
+
+
+class FakeResult:
+    def __init__(self, rows: list[tuple]):
+        self.rows = rows
+
+    def all(self) -> list[tuple]:
+        return self.rows
+
+
+class FakeSession:
+    """Отвечает на запросы слоя доступа по данным в памяти, записывает членство в проектах."""
+
+    def __init__(self):
+        self.roles: dict[tuple[UUID, UUID], str] = {}
+        self.columns: dict[UUID, UUID] = {}
+        self.tasks: dict[UUID, UUID] = {}
+        self.role_queries = 0
+
+    async def execute(self, statement):
+        params = statement.compile(dialect=postgresql.dialect()).params
+        if isinstance(statement, Insert) and statement.table.name == ProjectUser.__tablename__:
+            self.roles[(params["project_id"], params["user_id"])] = params["role"]
+            return FakeResult([])
+        if isinstance(statement, Delete) and statement.table.name == ProjectUser.__tablename__:
+            self.roles.pop((params["project_id_1"], params["user_id_1"]), None)
+            return FakeResult([])
+        assert isinstance(statement, Select), statement
+
+        selected = [(entry["entity"], entry["name"]) for entry in statement.column_descriptions]
+        if selected == [(ProjectUser, "project_id"), (ProjectUser, "role")]:
+            self.role_queries += 1
+            (user_id,) = params.values()
+            return FakeResult([
+                (project_id, role) for (project_id, member_id), role in self.roles.items() if member_id == user_id
+            ])
+        (ids,) = params.values()
+        if selected == [(BColumn, "id"), (BColumn, "project_id")]:
+            return FakeResult([(column_id, self.columns[column_id]) for column_id in ids if column_id in self.columns])
+        if selected == [(Task, "id"), (BColumn, "project_id")]:
+            return FakeResult([
+                (task_id, self.columns[self.tasks[task_id]]) for task_id in ids if task_id in self.tasks
+            ])
+        raise AssertionError(f"Unexpected query: {statement}")
+
+    async def commit(self):
+        pass
+
+
+class Board:
+    def __init__(self, session: FakeSession):
+        self.project = uuid4()
+        self.column = uuid4()
+        self.task = uuid4()
+        session.columns[self.column] = self.project
+        session.tasks[self.task] = self.column
+
+
+@pytest.fixture
+def session():
+    access_crud.project_roles.clear()
+    column_projects.clear()
+    return FakeSession()
+
+
+@pytest.fixture
+def users():
+    return {"owner": uuid4(), "member": uuid4(), "outsider": uuid4()}
+
+
+@pytest.fixture
+def board(session, users):
+    board = Board(session)
+    session.roles[(board.project, users["owner"])] = OWNER
+    session.roles[(board.project, users["member"])] = MEMBER
+    return board
+
+
+@pytest.fixture
+def other_board(session, users):
+    # проект, в котором состоит только outsider
+    board = Board(session)
+    session.roles[(board.project, users["outsider"])] = OWNER
+    return board
+
+
+@pytest.fixture
+def as_user(session, users):
+    current = {"user_id": None}
+    app.dependency_overrides[get_db] = lambda: session
+    app.dependency_overrides[get_read_db] = lambda: session
+    app.dependency_overrides[get_current_user] = lambda: User(id=current["user_id"])
+    test_client = TestClient(app)
+
+    def switch(name: str) -> TestClient:
+        # клиент общий: запросы после вызова идут от имени этого пользователя
+        current["user_id"] = users[name]
+        return test_client
+
+    yield switch
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """Обработчики после проверки доступа: вызов значит, что запрос прошел авторизацию."""
+    mocks = {
+        "get_project_users": AsyncMock(return_value=([], None)),
+        "update_project": AsyncMock(return_value=None),
+        "delete_project": AsyncMock(return_value=False),
+        "get_users_by_task": AsyncMock(return_value=([], None)),
+        "update_task": AsyncMock(return_value=None),
+        "move_task": AsyncMock(return_value=None),
+        "create_task": AsyncMock(side_effect=ValueError("not reached")),
+        "delete_column": AsyncMock(return_value=False),
+        "update_column": AsyncMock(return_value=None),
+        "create_column": AsyncMock(side_effect=ValueError("not reached")),
+        "bulk_create_tasks": AsyncMock(return_value=[]),
+        "bulk_update_tasks": AsyncMock(return_value=[]),
+        "bulk_delete_tasks": AsyncMock(return_value=[]),
+        "bulk_assign_users": AsyncMock(return_value=[]),
+    }
+    for module in (project_crud, task_crud, column_crud, task_bulk_crud):
+        for name, mock in mocks.items():
+            if hasattr(module, name):
+                monkeypatch.setattr(module, name, mock)
+    return mocks
+
+
+def test_non_member_is_denied_reads_and_writes(as_user, board, handlers):
+    outsider = as_user("outsider")
+    requests = [
+        ("get", f"/projects/{board.project}/users", None),
+        ("get", f"/tasks/{board.task}/users", None),
+        ("put", f"/tasks/{board.task}", {"priority": 1}),
+        ("delete", f"/columns/{board.column}", None),
+        ("post", "/columns/", {"name": "Todo", "project_id": str(board.project)}),
+        ("post", "/tasks/", {"title": "Task", "column_id": str(board.column)}),
+    ]
+    for method, path, body in requests:
+        response = outsider.request(method, path, json=body)
+        assert response.status_code == 403, (method, path)
+    assert not any(mock.called for mock in handlers.values())
+
+
+def test_member_passes_member_routes(as_user, board, handlers):
+    member = as_user("member")
+    assert member.get(f"/projects/{board.project}/users").status_code == 200
+    assert member.get(f"/tasks/{board.task}/users").status_code == 200
+    # обработчик вызван и сам ответил 404
+    assert member.put(f"/tasks/{board.task}", json={"priority": 1}).status_code == 404
+    assert member.delete(f"/columns/{board.column}").status_code == 404
+    assert handlers["update_task"].called and handlers["delete_column"].called
+
+
+def test_missing_task_and_column_are_404_not_403(as_user, board, handlers):
+    outsider = as_user("outsider")
+    assert outsider.get(f"/tasks/{uuid4()}/users").status_code == 404
+    assert outsider.delete(f"/columns/{uuid4()}").status_code == 404
+
+
+def test_owner_only_routes_reject_members(as_user, board, users, handlers):
+    member = as_user("member")
+    requests = [
+        ("put", f"/projects/{board.project}", {"name": "Renamed"}),
+        ("delete", f"/projects/{board.project}", None),
+        ("post", f"/projects/{board.project}/users/{uuid4()}", None),
+        ("delete", f"/projects/{board.project}/users/{users['owner']}", None),
+    ]
+    for method, path, body in requests:
+        assert member.request(method, path, json=body).status_code == 403, (method, path)
+    assert not handlers["update_project"].called and not handlers["delete_project"].called
+
+    owner = as_user("owner")
+    assert owner.delete(f"/projects/{board.project}").status_code == 404
+    assert handlers["delete_project"].called
+
+
+def test_task_cannot_be_moved_into_another_project(as_user, board, other_board, handlers):
+    member = as_user("member")
+    foreign_column = str(other_board.column)
+    assert member.put(f"/tasks/{board.task}", json={"column_id": foreign_column}).status_code == 403
+    assert member.post(f"/tasks/{board.task}/move", json={"column_id": foreign_column}).status_code == 403
+    assert not handlers["update_task"].called and not handlers["move_task"].called
+
+    # обратное направление: доступ к целевой колонке не дает доступа к чужой задаче
+    outsider = as_user("outsider")
+    assert outsider.post(f"/tasks/{board.task}/move", json={"column_id": foreign_column}).status_code == 403
+
+
+def test_column_update_cannot_change_project(as_user, board, other_board, handlers):
+    response = as_user("member").put(f"/columns/{board.column}", json={"project_id": str(other_board.project)})
+    assert response.status_code == 404
+    (_, _, column_data, _), _ = handlers["update_column"].call_args
+    assert "project_id" not in column_data.model_dump(exclude_unset=True)
+
+
+def test_bulk_requests_with_a_forbidden_id_fail_as_a_whole(as_user, board, other_board, handlers):
+    member = as_user("member")
+    own_task, foreign_task = str(board.task), str(other_board.task)
+    requests = [
+        ("post", "/tasks/bulk", {"tasks": [
+            {"title": "Own", "column_id": str(board.column)},
+            {"title": "Foreign", "column_id": str(other_board.column)},
+        ]}),
+        ("patch", "/tasks/bulk", {"tasks": [{"id": own_task, "priority": 1}, {"id": foreign_task, "priority": 1}]}),
+        ("patch", "/tasks/bulk", {"tasks": [{"id": own_task, "column_id": str(other_board.column)}]}),
+        ("post", "/tasks/bulk/delete", {"ids": [own_task, foreign_task]}),
+        ("post", "/tasks/bulk/assign", {"assignments": [
+            {"task_id": own_task, "user_id": str(uuid4())},
+            {"task_id": foreign_task, "user_id": str(uuid4())},
+        ]}),
+    ]
+    for method, path, body in requests:
+        assert member.request(method, path, json=body).status_code == 403, (method, path)
+    assert not any(mock.called for mock in handlers.values())
+
+
+def test_stale_cached_denial_is_rechecked(as_user, session, board, users, handlers):
+    outsider = as_user("outsider")
+    assert outsider.get(f"/projects/{board.project}/users").status_code == 403
+    # доступ выдан в обход этого процесса (другим воркером): кэш еще помнит отказ
+    session.roles[(board.project, users["outsider"])] = MEMBER
+    assert outsider.get(f"/projects/{board.project}/users").status_code == 200
+
+
+def test_role_cache_is_invalidated_on_membership_changes(as_user, session, board, users, handlers):
+    member_users = f"/projects/{board.project}/users"
+    membership = f"/projects/{board.project}/users/{users['member']}"
+    assert as_user("member").get(member_users).status_code == 200
+    assert access_crud.project_roles.get(users["member"]) == {board.project: MEMBER}
+
+    # без сброса кэша исключенный участник сохранил бы доступ до истечения TTL
+    assert as_user("owner").delete(membership).status_code == 200
+    assert access_crud.project_roles.get(users["member"]) is None
+    assert as_user("member").get(member_users).status_code == 403
+
+    assert as_user("owner").post(membership).status_code == 200
+    assert access_crud.project_roles.get(users["member"]) is None
+    queries = session.role_queries
+    assert as_user("member").get(member_users).status_code == 200
+    # доступ вернулся за одно чтение карты, без повторной проверки перед отказом
+    assert session.role_queries == queries + 1
+
+
+@pytest.mark.parametrize("token, authorization, expected", [
+    (None, None, 401),
+    (None, "Bearer anything", 401),
+    ("scrape-secret", None, 401),
+    ("scrape-secret", "Bearer wrong", 401),
+    ("scrape-secret", "Bearer scrape-secret", 200),
+])
+def test_metrics_require_scrape_token(monkeypatch, token, authorization, expected):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", token)
+    headers = {"Authorization": authorization} if authorization else {}
+    assert TestClient(app).get("/metrics", headers=headers).status_code == expected
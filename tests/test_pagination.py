@@ -0,0 +1,144 @@
+import asyncio
+import base64
+import json
+import random
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Uuid, create_engine, insert, select
+
+from src.core.pagination import decode_cursor, encode_cursor, paginate
+from src.core.replicas import get_read_db
+from src.main import app
+from src.models.models import User
+from src.security import get_current_user
+
+metadata = MetaData()
+items = Table(
+    "items",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("priority", Integer, nullable=True),
+)
+
+
+class SyncSession:
+    # paginate нужен только execute: SQLite выполняет тот же SQL, что получил бы Postgres
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def execute(self, query):
+        return self.connection.execute(query)
+
+
+@pytest.fixture(scope="module")
+def rows():
+    rng = random.Random(7)
+    start = datetime(2026, 1, 1)
+    # повторяющиеся значения ключей заставляют доходить до тай-брейкера id
+    return [
+        {
+            "id": UUID(int=rng.getrandbits(128), version=4),
+            "name": f"item {index}",
+            "created_at": start + timedelta(hours=rng.randrange(5)),
+            "priority": rng.choice([None, 1, 2, 3]),
+        }
+        for index in range(60)
+    ]
+
+
+@pytest.fixture(scope="module")
+def connection(rows):
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.connect() as connection:
+        connection.execute(insert(items), rows)
+        yield connection
+
+
+def expected_order(rows: list[dict], order: list[tuple]) -> list[UUID]:
+    # порядок Postgres по умолчанию: NULL в конце при asc и в начале при desc
+    result = list(rows)
+    for column, descending in reversed(order):
+        result.sort(
+            key=lambda row: (row[column.key] is None, row[column.key] or 0),
+            reverse=descending
+        )
+    return [row["id"] for row in result]
+
+
+def read_all_pages(connection, order: list[tuple], limit: int) -> list[UUID]:
+    session = SyncSession(connection)
+    seen, cursor = [], None
+    while True:
+        page, cursor = asyncio.run(paginate(session, select(items), order, limit, cursor, mappings=True))
+        seen.extend(row["id"] for row in page)
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("order", [
+    [(items.c.created_at, False), (items.c.id, False)],
+    [(items.c.created_at, True), (items.c.id, True)],
+    [(items.c.priority, False), (items.c.id, False)],
+    [(items.c.priority, True), (items.c.id, True)],
+    [(items.c.created_at, False), (items.c.priority, True), (items.c.id, True)],
+    [(items.c.priority, True), (items.c.created_at, False), (items.c.id, False)],
+    [(items.c.name, True), (items.c.id, False)],
+], ids=["asc", "desc", "nullable-asc", "nullable-desc", "mixed", "mixed-nullable-first", "mixed-unique"])
+@pytest.mark.parametrize("limit", [1, 7, 60])
+def test_pages_cover_all_rows_in_order(connection, rows, order, limit):
+    assert read_all_pages(connection, order, limit) == expected_order(rows, order)
+
+
+def test_cursor_round_trip():
+    columns = [items.c.created_at, items.c.priority, items.c.priority, items.c.name, items.c.id]
+    values = [datetime(2026, 3, 1, 12, 30, 15, 250), 3, None, "board", UUID("12345678-1234-5678-1234-567812345678")]
+    assert decode_cursor(encode_cursor(values), columns) == values
+
+
+def _cursor(payload: str) -> str:
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+BY_CREATED = (items.c.created_at, items.c.id)
+BY_PRIORITY = (items.c.priority, items.c.id)
+
+
+@pytest.mark.parametrize("cursor, keys", [
+    ("not a cursor!", BY_CREATED),
+    (_cursor("not json"), BY_CREATED),
+    (_cursor(json.dumps({"created_at": "2026-01-01"})), BY_CREATED),
+    (_cursor(json.dumps(["2026-01-01T00:00:00"])), BY_CREATED),
+    (_cursor(json.dumps(["yesterday", "12345678-1234-5678-1234-567812345678"])), BY_CREATED),
+    (_cursor(json.dumps(["2026-01-01T00:00:00", "not-a-uuid"])), BY_CREATED),
+    (_cursor(json.dumps(["2026-01-01T00:00:00", ["nested"]])), BY_CREATED),
+    (_cursor(json.dumps(["2026-01-01T00:00:00", 5])), BY_CREATED),
+    (_cursor('[1e400, "12345678-1234-5678-1234-567812345678"]'), BY_PRIORITY),
+    (_cursor(json.dumps(["5", "12345678-1234-5678-1234-567812345678"])), BY_PRIORITY),
+    (_cursor(json.dumps([True, "12345678-1234-5678-1234-567812345678"])), BY_PRIORITY),
+])
+def test_malformed_cursor_is_rejected(cursor, keys):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, list(keys))
+    assert error.value.status_code == 400
+
+
+def test_malformed_cursor_returns_400_from_list_endpoint():
+    class NoQueries:
+        async def execute(self, query):
+            raise AssertionError("invalid cursor must be rejected before querying")
+
+    app.dependency_overrides[get_read_db] = NoQueries
+    app.dependency_overrides[get_current_user] = lambda: User(id=UUID(int=1))
+    try:
+        response = TestClient(app).get("/users/", params={"cursor": "garbage"})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
@@ -0,0 +1,28 @@
+import pytest
+from pydantic import ValidationError
+
+from src.settings import Settings
+
+
+@pytest.mark.parametrize("max_connections, events, pool_size, max_overflow", [
+    (40, "true", 9, 0),
+    (80, "true", 10, 9),
+    (4, "false", 1, 0),
+])
+def test_connection_budget_is_split_between_workers(monkeypatch, max_connections, events, pool_size, max_overflow):
+    monkeypatch.setenv("SERVER_TEST", "false")
+    monkeypatch.setenv("SERVER_WORKERS", "4")
+    monkeypatch.setenv("DB_MAX_CONNECTIONS", str(max_connections))
+    monkeypatch.setenv("EVENTS_ENABLED", events)
+    settings = Settings()
+    assert (settings.db_pool_size, settings.db_max_overflow) == (pool_size, max_overflow)
+
+
+@pytest.mark.parametrize("max_connections, events", [(4, "true"), (7, "true"), (3, "false")])
+def test_connection_budget_below_worker_count_fails_at_startup(monkeypatch, max_connections, events):
+    monkeypatch.setenv("SERVER_TEST", "false")
+    monkeypatch.setenv("SERVER_WORKERS", "4")
+    monkeypatch.setenv("DB_MAX_CONNECTIONS", str(max_connections))
+    monkeypatch.setenv("EVENTS_ENABLED", events)
+    with pytest.raises(ValidationError, match="DB_MAX_CONNECTIONS"):
+        Settings()